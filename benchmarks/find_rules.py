@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""Compare Grammar.find_rules suffix trie lookup with the old linear scan.
+
+    $ python benchmarks/find_rules.py -n 20000
+"""
+
+import random
+import pathlib
+import argparse
+import timeit
+
+import pkg_resources as pres
+
+from gramtool.parser import get_grammar_rules
+from gramtool.grammar import Grammar
+from gramtool.utils.grammar import get_grammar_tree
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+def linear_scan(grammar, word):
+    for rule in grammar.stems.get(word, []):
+        yield word, '', grammar.rules[rule]
+
+    for suffix, rules in grammar.suffixes:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)] if suffix else word
+            for rule in rules:
+                yield stem, suffix, grammar.rules[rule]
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=10000, help="Number of sampled words.")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="Number of timing runs.")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    tree = get_grammar_tree(str(data / 'grammar.yaml'))
+    rules = get_grammar_rules(tree, str(data / args.lang / 'grammar'))
+    grammar = Grammar(None, tree, rules)
+
+    stems = get_dictionary_stems(str(data / args.lang / 'hunspell.aff'), str(data / args.lang / 'hunspell.dic'))
+    words = random.Random(args.seed).sample(stems, min(args.words, len(stems)))
+
+    for word in words:
+        assert list(grammar.find_rules(word)) == list(linear_scan(grammar, word)), word
+
+    def run(find):
+        return lambda: [list(find(word)) for word in words]
+
+    print('%d words, %d distinct suffixes' % (len(words), len(grammar.suffixes)))
+    for name, find in [
+        ('linear scan', lambda word: linear_scan(grammar, word)),
+        ('suffix trie', grammar.find_rules),
+    ]:
+        best = min(timeit.repeat(run(find), number=1, repeat=args.repeat))
+        print('%-12s %8.2f us/word' % (name, best / len(words) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""Compare get_lemma on words typed without diacritics, with and without folded index.
+
+Lexicon and folded index are built for a sample of dictionary words only, all
+their forms with diacritics are folded and lemmatized. Lemma is correct, if
+it is the same as the lemma of the original form.
+
+    $ python benchmarks/folded.py -n 300
+"""
+
+import time
+import random
+import pathlib
+import argparse
+import tempfile
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.lexicon import build_lexicon
+from gramtool.lexicon import write_lexicon
+from gramtool.lexicon import get_lexicon_hash
+from gramtool.folding import fold
+from gramtool.folding import compile_folded_index
+from gramtool.paradigms import get_dictionary_words
+
+
+def run(gt, words, expected):
+    start = time.perf_counter()
+    lemmas = [gt.get_lemma(word) for word in words]
+    elapsed = time.perf_counter() - start
+    correct = sum(lemma == lemma_ for lemma, lemma_ in zip(lemmas, expected))
+    return correct, elapsed
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=300, help="Number of sampled dictionary words.")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Number of worker processes.")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    words = get_dictionary_words(data, args.lang)
+    words = sorted(random.Random(args.seed).sample(words, min(args.words, len(words))))
+
+    start = time.perf_counter()
+    lexicon = build_lexicon(data, args.lang, jobs=args.jobs, words=words)
+    print('lexicon: %d forms, built in %.1f s' % (len(lexicon), time.perf_counter() - start))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lexicon_path = pathlib.Path(tmp) / 'lexicon'
+        folded_path = pathlib.Path(tmp) / 'folded'
+        with lexicon_path.open('wb') as f:
+            write_lexicon(lexicon, f, get_lexicon_hash(data, args.lang))
+        size = compile_folded_index(data, args.lang, lexicon_path, folded_path)
+        print('folded index: %d keys, %d bytes' % (size, folded_path.stat().st_size))
+
+        plain = gramtool.GramTool(data, args.lang)
+        folded = gramtool.GramTool(data, args.lang, lexicon=lexicon_path, folded=folded_path)
+
+        forms = [form for form in lexicon if fold(form) != form]
+        inputs = [fold(form) for form in forms]
+        expected = [plain.get_lemma(form) for form in forms]
+        print('%d forms with diacritics' % len(forms))
+
+        for name, gt in [('without index', plain), ('with index', folded)]:
+            correct, elapsed = run(gt, inputs, expected)
+            print('%-14s %5.1f%% correct, %.1f us/word' % (
+                name, 100 * correct / len(inputs), elapsed / len(inputs) * 1e6,
+            ))
+
+
+if __name__ == '__main__':
+    main()
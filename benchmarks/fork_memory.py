@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""Measure total memory of N forked worker processes doing lookups.
+
+Modes:
+
+    independent  each worker loads its own GramTool after fork
+    preload      parent loads GramTool, workers inherit it
+    prefork      parent calls gramtool.prefork()
+
+Memory is reported as the sum of PSS (proportional set size, shared pages are
+divided between processes sharing them) of the parent and all workers, read
+from /proc/<pid>/smaps_rollup while all workers are alive, so Linux only.
+After lookups each worker runs a full garbage collection, like long running
+workers eventually do.
+
+    $ python benchmarks/fork_memory.py -w 1 -w 4 -w 8
+"""
+
+import gc
+import sys
+import json
+import random
+import pathlib
+import argparse
+import subprocess
+import multiprocessing
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+MODES = ('independent', 'preload', 'prefork')
+
+
+def get_memory():
+    result = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:', 'Private_Dirty:'):
+                result[parts[0][:-1].lower() + '_kb'] = int(parts[1])
+    return result
+
+
+def worker(mode, words, barrier, queue):
+    gt = gramtool.GramTool() if mode == 'independent' else gramtool.get_gramtool()
+    for word in words:
+        gt.get_lemma(word)
+    gc.collect()
+    barrier.wait()
+    queue.put(get_memory())
+    barrier.wait()
+
+
+def run(mode, nworkers, words):
+    if mode == 'preload':
+        gramtool.preload()
+    elif mode == 'prefork':
+        gramtool.prefork()
+
+    ctx = multiprocessing.get_context('fork')
+    barrier = ctx.Barrier(nworkers + 1)
+    queue = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, words, barrier, queue)) for i in range(nworkers)]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    parent = get_memory()
+    workers = [queue.get() for process in processes]
+    barrier.wait()
+    for process in processes:
+        process.join()
+
+    return {
+        'mode': mode,
+        'workers': nworkers,
+        'total_pss_kb': parent['pss_kb'] + sum(w['pss_kb'] for w in workers),
+        'worker_pss_kb': sum(w['pss_kb'] for w in workers) // nworkers,
+        'worker_rss_kb': sum(w['rss_kb'] for w in workers) // nworkers,
+        'worker_private_dirty_kb': sum(w['private_dirty_kb'] for w in workers) // nworkers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-w', '--workers', type=int, action='append', help="Number of workers, can be repeated.")
+    parser.add_argument('-m', '--mode', action='append', choices=MODES, help="Mode, can be repeated [default: all].")
+    parser.add_argument('-n', '--words', type=int, default=500, help="Number of words looked up by each worker.")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    data = pathlib.Path(pres.resource_filename('gramtool', 'data'))
+    stems = get_dictionary_stems(str(data / 'lt' / 'hunspell.aff'), str(data / 'lt' / 'hunspell.dic'))
+    words = random.Random(0).sample(stems, args.words)
+
+    if args.child:
+        print(json.dumps(run(args.mode[0], args.workers[0], words)))
+        return
+
+    # Each measurement runs in a fresh interpreter, because modes change global state.
+    print('%-12s %8s %14s %14s %14s %14s' % (
+        'mode', 'workers', 'total PSS MiB', 'worker PSS', 'worker RSS', 'private dirty',
+    ))
+    for nworkers in args.workers or [1, 4]:
+        for mode in args.mode or MODES:
+            output = subprocess.check_output([
+                sys.executable, __file__, '--child', '-m', mode, '-w', str(nworkers), '-n', str(args.words),
+            ])
+            r = json.loads(output.decode())
+            print('%-12s %8d %14.1f %14.1f %14.1f %14.1f' % (
+                mode, nworkers, r['total_pss_kb'] / 1024, r['worker_pss_kb'] / 1024,
+                r['worker_rss_kb'] / 1024, r['worker_private_dirty_kb'] / 1024,
+            ))
+
+
+if __name__ == '__main__':
+    main()
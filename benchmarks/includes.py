@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""Time Parser.process_includes on a generated grammar, where many rules share macros.
+
+Each rule includes a chain of macros, each including the next one several
+times with different specs, like adjective degrees, genders and cases.
+
+    $ python benchmarks/includes.py --rules 200 --depth 3
+"""
+
+import io
+import time
+import argparse
+
+from gramtool.parser import Parser
+
+
+TREE = {
+    'pos': {'x': 'fake'},
+    'grammar': {'fake': ['a', 'b', 'c', 'd', 'e']},
+}
+
+
+def spec(position, letter):
+    return 'x' + ''.join(letter if i == position else '*' for i in range(5))
+
+
+def generate_grammar(nrules, depth, width):
+    lines = ['@macro m0']
+    for i in range(width * 2):
+        lines.append('%s . e%d' % (spec(depth, 'abcdefghij'[i]), i))
+    for d in range(1, depth + 1):
+        lines += ['', '@macro m%d' % d]
+        for i in range(width):
+            lines.append('+ m%d %s . s%d%d' % (d - 1, spec(depth - d, 'abcdefghij'[i]), d, i))
+    for r in range(nrules):
+        lines += ['', '@rule r%d' % r, '+ m%d * . r%d' % (depth, r)]
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rules', type=int, default=200, help="Number of rules.")
+    parser.add_argument('--depth', type=int, default=3, help="Macro include depth.")
+    parser.add_argument('--width', type=int, default=3, help="Includes per macro.")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Number of runs, best is reported.")
+    args = parser.parse_args()
+
+    source = generate_grammar(args.rules, args.depth, args.width)
+    times = []
+    for i in range(args.repeat):
+        p = Parser(TREE, strict=False)
+        p.parse_rules(io.StringIO(source), 'generated')
+        start = time.perf_counter()
+        rules = p.process_includes()
+        times.append(time.perf_counter() - start)
+    nforms = sum(len(rule.forms) for rule in rules.values())
+    print('%d rules, %d forms, process_includes: %.1f ms' % (len(rules), nforms, min(times) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+"""Load test a running gramtool server.
+
+    $ gramtool --serve unix:/tmp/gramtool.sock &
+    $ python benchmarks/server_load.py unix:/tmp/gramtool.sock -c 8 -n 500 --batch 20
+"""
+
+import time
+import random
+import pathlib
+import argparse
+import threading
+
+import pkg_resources as pres
+
+from gramtool.client import Client
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('address', type=str, help="Server address, unix:/path or host:port.")
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-c', '--clients', type=int, default=4, help="Number of concurrent clients.")
+    parser.add_argument('-n', '--requests', type=int, default=200, help="Requests per client.")
+    parser.add_argument('--batch', type=int, default=1, help="Words per request.")
+    parser.add_argument('--method', type=str, default='lemma', help="Server method [default: lemma].")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir) / args.lang
+    stems = get_dictionary_stems(str(data / 'hunspell.aff'), str(data / 'hunspell.dic'))
+    rand = random.Random(args.seed)
+    words = rand.sample(stems, min(len(stems), args.clients * args.requests * args.batch))
+
+    latencies = []
+    errors = []
+
+    def run(i):
+        offset = i * args.requests * args.batch
+        with Client(args.address) as client:
+            for j in range(args.requests):
+                start = offset + j * args.batch
+                requests = [{'method': args.method, 'word': w} for w in words[start:start + args.batch]]
+                t = time.perf_counter()
+                responses = client.batch(requests)
+                latencies.append(time.perf_counter() - t)
+                errors.extend(r for r in responses if 'error' in r)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    nwords = len(latencies) * args.batch
+    print('%d clients, %d requests, %d words, %d errors in %.2f s' % (
+        args.clients, len(latencies), nwords, len(errors), elapsed,
+    ))
+    print('throughput: %.1f requests/s, %.1f words/s' % (len(latencies) / elapsed, nwords / elapsed))
+    print('latency: p50 %.2f ms, p95 %.2f ms, p99 %.2f ms' % tuple(
+        percentile(latencies, p) * 1000 for p in (50, 95, 99)
+    ))
+
+
+if __name__ == '__main__':
+    main()
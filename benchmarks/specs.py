@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""Micro-benchmark check_spec, change_spec and get_properties.
+
+Calls each function with all form specs of the grammar rules, like
+GramTool.change_form and the API do for each word.
+
+    $ python benchmarks/specs.py -r 5
+"""
+
+import timeit
+import pathlib
+import argparse
+
+import pkg_resources as pres
+
+from gramtool.parser import get_grammar_rules
+from gramtool.grammar import check_spec
+from gramtool.grammar import change_spec
+from gramtool.grammar import get_properties
+from gramtool.utils.grammar import get_grammar_tree
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="Number of runs, best is reported.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    symbols = get_grammar_tree(str(data / 'grammar.yaml'))
+    rules = get_grammar_rules(symbols, str(data / args.lang / 'grammar'))
+    specs = sorted({
+        form.spec for rule in rules.values() for form in rule.forms.values()
+        if form.spec[0] in symbols['pos'] and not set(form.spec) & set('-*?')
+    })
+
+    benchmarks = [
+        ('check_spec', lambda: [check_spec(symbols, spec, case='genitive', number='plural') for spec in specs]),
+        ('change_spec', lambda: [change_spec(symbols, spec, case='genitive', number='plural') for spec in specs]),
+        ('get_properties', lambda: [get_properties(symbols, spec) for spec in specs]),
+    ]
+    print('%d specs' % len(specs))
+    for name, func in benchmarks:
+        best = min(timeit.repeat(func, number=20, repeat=args.repeat)) / 20
+        print('%-15s %.2f us/call' % (name, best / len(specs) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""Count hunspell calls per get_lemma lookup on a sample of dictionary words.
+
+Spell cache is disabled, so that every spell check of a rule form is
+counted. Words are looked up in sample order, the same way as in a
+running service, so that learned form order is included in the count.
+
+    $ python benchmarks/spell_calls.py -n 2000
+    $ python benchmarks/spell_calls.py -n 2000 --stem-constraints
+"""
+
+import time
+import random
+import pathlib
+import argparse
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.cache import LRUCache
+from gramtool.paradigms import get_dictionary_words
+
+
+class CountingSpeller(object):
+    def __init__(self, hs):
+        self.hs = hs
+        self.calls = 0
+
+    def spell(self, word):
+        self.calls += 1
+        return self.hs.spell(word)
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=2000, help="Number of sampled words.")
+    parser.add_argument('--spell-checker', choices=['hunspell', 'affixes'], default='hunspell', help=(
+        "Spell checker [default: hunspell]."
+    ))
+    parser.add_argument('--stem-constraints', action='store_true', default=False, help=(
+        "Drop candidate rules with stem constraints, built on first run."
+    ))
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    words = get_dictionary_words(data, args.lang)
+    words = random.Random(args.seed).sample(words, min(args.words, len(words)))
+
+    gt = gramtool.GramTool(data, args.lang, spell_cache=LRUCache(maxsize=0), spell_checker=args.spell_checker,
+                           stem_constraints=args.stem_constraints)
+    speller = CountingSpeller(gt.grammar.hs)
+    gt.grammar.hs = speller
+
+    # Calls of the second half show the count, once form order has been learned.
+    half = len(words) // 2
+    start = time.perf_counter()
+    lemmas = [gt.get_lemma(word) for word in words[:half]]
+    first = speller.calls
+    lemmas += [gt.get_lemma(word) for word in words[half:]]
+    elapsed = time.perf_counter() - start
+
+    print('hunspell calls per lookup: %.2f all, %.2f first half, %.2f second half' % (
+        speller.calls / len(words), first / half, (speller.calls - first) / (len(words) - half),
+    ))
+    candidates = sum(1 for word in words for candidate in gt.grammar.find_rules(word))
+    print('candidate rules per lookup: %.2f' % (candidates / len(words)))
+    print('get_lemma: %.1f us/word, %d lemmas found' % (
+        elapsed / len(words) * 1e6, sum(1 for lemma in lemmas if lemma),
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""Measure how many hunspell calls the spell filter saves on get_lemma.
+
+Filter is built on first run (takes a few minutes) and then loaded from cache.
+
+    $ python benchmarks/spell_filter.py -n 2000 -e 0.01
+"""
+
+import time
+import random
+import pathlib
+import argparse
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.cache import LRUCache
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+class CountingSpeller(object):
+    def __init__(self, hs):
+        self.hs = hs
+        self.calls = 0
+        self.misspelled = 0
+
+    def spell(self, word):
+        self.calls += 1
+        result = self.hs.spell(word)
+        self.misspelled += not result
+        return result
+
+
+def run(gt, words):
+    speller = CountingSpeller(gt.hunspell)
+    gt.grammar.hs = speller
+    start = time.perf_counter()
+    lemmas = [gt.get_lemma(word) for word in words]
+    return lemmas, speller, time.perf_counter() - start
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=1000, help="Number of sampled words.")
+    parser.add_argument('-e', '--error-rate', type=float, default=0.01, help="False positive rate [default: 0.01].")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    stems = get_dictionary_stems(str(data / args.lang / 'hunspell.aff'), str(data / args.lang / 'hunspell.dic'))
+    words = random.Random(args.seed).sample(stems, min(args.words, len(stems)))
+
+    # Spell cache is disabled, to count every spell check.
+    plain = gramtool.GramTool(data, args.lang, spell_cache=LRUCache(maxsize=0))
+    filtered = gramtool.GramTool(data, args.lang, spell_cache=LRUCache(maxsize=0), spell_filter=args.error_rate)
+
+    expected, plain_speller, plain_time = run(plain, words)
+    lemmas, filtered_speller, filtered_time = run(filtered, words)
+
+    info = filtered.spell_filter.info()
+    print('filter: %.1f MiB, %d hash functions' % (info['nbits'] / 8 / 2 ** 20, info['nhashes']))
+    print('hunspell calls: %d without filter, %d with filter (%.1f%% saved)' % (
+        plain_speller.calls, filtered_speller.calls, 100 * (1 - filtered_speller.calls / plain_speller.calls),
+    ))
+    print('misspelled: %d without filter, %d passed filter' % (plain_speller.misspelled, filtered_speller.misspelled))
+    print('filter checks: %d, rejected: %d' % (info['checks'], info['rejects']))
+    print('get_lemma: %.1f us/word without filter, %.1f us/word with filter' % (
+        plain_time / len(words) * 1e6, filtered_time / len(words) * 1e6,
+    ))
+    print('same lemmas: %s' % (lemmas == expected))
+
+
+if __name__ == '__main__':
+    main()
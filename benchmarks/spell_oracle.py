@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""Compare AffixDictionary with hunspell, for correctness and speed.
+
+Checked words are dictionary words and all forms, that grammar rules generate
+and spell check for them, both correct and incorrect. Without -n the whole
+dictionary is checked. Exits with 1 if results differ.
+
+Spell filter and stem constraints are built from AffixDictionary.iter_words,
+so it is also checked, that every alphabetic word hunspell accepts is
+generated by it, ignoring case.
+
+    $ python benchmarks/spell_oracle.py
+    $ python benchmarks/spell_oracle.py -n 2000
+"""
+
+import sys
+import time
+import random
+import pathlib
+import argparse
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.affixes import get_affix_dict
+from gramtool.hunspell import get_hunspell_dict
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+def get_words(grammar, stems):
+    words = set(stems)
+    for word in stems:
+        for stem, suffix, rule in grammar.find_rules(word):
+            words.update(rule.build_forms(stem))
+    return sorted(words)
+
+
+def get_missing_words(affixes, accepted):
+    """Return words of accepted, whose lower cased form is not generated by iter_words."""
+    missing = {word.lower() for word in accepted if word.isalpha()}
+    for word in affixes.iter_words():
+        missing.discard(word.lower())
+    return sorted(missing)
+
+
+def timeit(spell, words):
+    start = time.perf_counter()
+    results = [spell(word) for word in words]
+    return results, time.perf_counter() - start
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=None, help="Number of sampled dictionary words.")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    parser.add_argument('--show', type=int, default=20, help="Number of differences to print.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    aff = str(data / args.lang / 'hunspell.aff')
+    dic = str(data / args.lang / 'hunspell.dic')
+
+    stems = get_dictionary_stems(aff, dic)
+    if args.words:
+        stems = random.Random(args.seed).sample(stems, min(args.words, len(stems)))
+    gt = gramtool.GramTool(pathlib.Path(args.data_dir), args.lang)
+    words = get_words(gt.grammar, stems)
+
+    start = time.perf_counter()
+    affixes = get_affix_dict(aff, dic)
+    print('affix dictionary loaded in %.2f s, %d words' % (time.perf_counter() - start, len(affixes.words)))
+
+    hunspell = get_hunspell_dict(aff, dic)
+    expected, hunspell_time = timeit(hunspell.spell, words)
+    results, affixes_time = timeit(affixes.spell, words)
+
+    diff = [(w, e, r) for w, e, r in zip(words, expected, results) if e != r]
+    print('checked %d words (%d correct), %d differences' % (len(words), sum(map(bool, expected)), len(diff)))
+    print('hunspell: %.2f us/word, affixes: %.2f us/word' % (
+        hunspell_time / len(words) * 1e6, affixes_time / len(words) * 1e6,
+    ))
+    for word, e, r in diff[:args.show]:
+        print('  %s: hunspell=%s affixes=%s' % (word, bool(e), bool(r)))
+
+    missing = get_missing_words(affixes, [word for word, e in zip(words, expected) if e])
+    print('%d words accepted by hunspell, but not generated by iter_words' % len(missing))
+    for word in missing[:args.show]:
+        print('  %s' % word)
+    return 1 if diff or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
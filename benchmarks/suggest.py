@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""Compare suggest index with hunspell suggestions on misspelled dictionary words.
+
+Each sampled word gets one random edit (deleted, inserted, replaced or
+swapped letter). Recall is the share of words, whose original spelling is
+among the first 1 or 5 suggestions.
+
+    $ python benchmarks/suggest.py -n 200 --index lt.suggest
+"""
+
+import time
+import random
+import pathlib
+import argparse
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.suggest import compile_suggest_index
+from gramtool.paradigms import get_dictionary_words
+
+
+LETTERS = 'aąbcčdeęėfghiįyjklmnoprsštuųūvzž'
+
+
+def corrupt(word, rand):
+    i = rand.randrange(len(word))
+    edit = rand.choice(['delete', 'insert', 'replace', 'swap'] if len(word) > 1 else ['insert', 'replace'])
+    if edit == 'delete':
+        return word[:i] + word[i + 1:]
+    elif edit == 'insert':
+        return word[:i] + rand.choice(LETTERS) + word[i:]
+    elif edit == 'replace':
+        return word[:i] + rand.choice(LETTERS.replace(word[i], '')) + word[i + 1:]
+    else:
+        i = min(i, len(word) - 2)
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def run(suggest, pairs):
+    times = []
+    top1 = top5 = 0
+    for word, misspelled in pairs:
+        start = time.perf_counter()
+        suggestions = suggest(misspelled)
+        times.append(time.perf_counter() - start)
+        top1 += word in suggestions[:1]
+        top5 += word in suggestions[:5]
+    times.sort()
+    return top1 / len(pairs), top5 / len(pairs), sum(times) / len(times), times[int(len(times) * 0.99)]
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=200, help="Number of sampled dictionary words.")
+    parser.add_argument('--index', type=str, default='suggest.index', help="Suggest index file, built if missing.")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    index_path = pathlib.Path(args.index)
+    if not index_path.exists():
+        start = time.perf_counter()
+        compile_suggest_index(data, args.lang, index_path)
+        print('index built in %.1f s, %d bytes' % (time.perf_counter() - start, index_path.stat().st_size))
+
+    rand = random.Random(args.seed)
+    words = [word for word in get_dictionary_words(data, args.lang) if len(word) > 2]
+    pairs = [(word, corrupt(word, rand)) for word in rand.sample(words, min(args.words, len(words)))]
+
+    gt = gramtool.GramTool(data, args.lang, suggest_index=index_path)
+    for name, suggest in [('hunspell', gt.hunspell.suggest), ('index', gt.suggest)]:
+        top1, top5, mean, p99 = run(suggest, pairs)
+        print('%-9s recall@1 %5.1f%%  recall@5 %5.1f%%  mean %8.2f ms  p99 %8.2f ms' % (
+            name, top1 * 100, top5 * 100, mean * 1000, p99 * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""Benchmark gramtool lookup hot paths.
+
+Times each benchmark over a reproducible word sample drawn from hunspell.dic,
+reports throughput, latency percentiles and peak Python memory as JSON.
+
+    $ python benchmarks/suite.py -n 2000 -o baseline.json
+    $ python benchmarks/suite.py -n 2000 -o current.json --compare baseline.json
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import pathlib
+import argparse
+import platform
+import tracemalloc
+
+from collections import OrderedDict
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool import api
+from gramtool.parser import Parser
+from gramtool.utils.grammar import get_grammar_tree
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+class Context(object):
+    def __init__(self, data_dir, language, words):
+        self.data_dir = data_dir
+        self.language = language
+        self.words = words
+        self._gt = None
+
+    @property
+    def gt(self):
+        if self._gt is None:
+            self._gt = gramtool.GramTool(self.data_dir, self.language)
+        # Each benchmark starts with an empty spell cache, to be reproducible.
+        self._gt.spell_cache.clear()
+        return self._gt
+
+    def parsers(self, n, process_includes=True):
+        tree = get_grammar_tree(str(self.data_dir / 'grammar.yaml'))
+        filename = str(self.data_dir / self.language / 'grammar')
+        with open(filename) as f:
+            source = f.read()
+        result = []
+        for i in range(n):
+            parser = Parser(tree)
+            if not process_includes:
+                parser.parse_rules(io.StringIO(source), filename)
+            result.append((parser, source, filename))
+        return result
+
+
+def bench_gramtool_init(ctx, n):
+    return (lambda i: gramtool.GramTool(ctx.data_dir, ctx.language)), range(max(1, n // 500))
+
+
+def bench_gramtool_init_no_snapshot(ctx, n):
+    return (lambda i: gramtool.GramTool(ctx.data_dir, ctx.language, snapshot=False)), range(max(1, n // 500))
+
+
+def bench_parser_parse(ctx, n):
+    def parse(item):
+        parser, source, filename = item
+        parser.parse(io.StringIO(source), filename)
+    return parse, ctx.parsers(max(1, n // 100))
+
+
+def bench_parser_process_includes(ctx, n):
+    return (lambda item: item[0].process_includes()), ctx.parsers(max(1, n // 100), process_includes=False)
+
+
+def bench_find_rules(ctx, n):
+    grammar = ctx.gt.grammar
+    return (lambda word: list(grammar.find_rules(word))), ctx.words
+
+
+def bench_build_forms(ctx, n):
+    grammar = ctx.gt.grammar
+
+    def build_forms(word):
+        for stem, suffix, rule in grammar.find_rules(word):
+            list(rule.build_forms(stem))
+    return build_forms, ctx.words
+
+
+def bench_iter_rules(ctx, n):
+    grammar = ctx.gt.grammar
+    return (lambda word: list(grammar.iter_rules(word))), ctx.words
+
+
+def bench_get_lemma(ctx, n):
+    return ctx.gt.get_lemma, ctx.words
+
+
+def bench_change_form(ctx, n):
+    gt = ctx.gt
+    return (lambda word: gt.change_form(word, case='genitive')), ctx.words
+
+
+def bench_api_lemma(ctx, n):
+    api.load(ctx.language).spell_cache.clear()
+    return (lambda word: api.lemma(word, ctx.language)), ctx.words
+
+
+BENCHMARKS = OrderedDict([
+    ('gramtool_init', bench_gramtool_init),
+    ('gramtool_init_no_snapshot', bench_gramtool_init_no_snapshot),
+    ('parser_parse', bench_parser_parse),
+    ('parser_process_includes', bench_parser_process_includes),
+    ('find_rules', bench_find_rules),
+    ('build_forms', bench_build_forms),
+    ('iter_rules', bench_iter_rules),
+    ('get_lemma', bench_get_lemma),
+    ('change_form', bench_change_form),
+    ('api_lemma', bench_api_lemma),
+])
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run_benchmark(ctx, bench, n, memory=True):
+    func, items = bench(ctx, n)
+    items = list(items)
+    latencies = []
+    for item in items:
+        t = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t)
+
+    result = OrderedDict()
+    total = sum(latencies)
+    latencies.sort()
+    result['n'] = len(latencies)
+    result['total_s'] = total
+    result['throughput_per_s'] = len(latencies) / total if total else None
+    for p in (50, 90, 99):
+        result['p%d_ms' % p] = percentile(latencies, p) * 1000
+    result['max_ms'] = latencies[-1] * 1000
+
+    if memory:
+        # Separate run, because tracemalloc slows everything down.
+        func, items = bench(ctx, n)
+        tracemalloc.start()
+        for item in items:
+            func(item)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_memory_kb'] = peak / 1024
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Print comparison table, return names of benchmarks that regressed."""
+    regressions = []
+    print('%-28s %12s %12s %8s' % ('benchmark', 'baseline/s', 'current/s', 'ratio'), file=sys.stderr)
+    for name, result in results.items():
+        if name not in baseline or not result['throughput_per_s'] or not baseline[name]['throughput_per_s']:
+            continue
+        ratio = result['throughput_per_s'] / baseline[name]['throughput_per_s']
+        mark = ''
+        if ratio < 1 - threshold:
+            mark = ' REGRESSION'
+            regressions.append(name)
+        print('%-28s %12.1f %12.1f %8.2f%s' % (
+            name, baseline[name]['throughput_per_s'], result['throughput_per_s'], ratio, mark,
+        ), file=sys.stderr)
+    return regressions
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=1000, help="Number of sampled words.")
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    parser.add_argument('-b', '--bench', action='append', choices=list(BENCHMARKS), help=(
+        "Run only given benchmark, can be repeated [default: all]."
+    ))
+    parser.add_argument('--no-memory', action='store_true', default=False, help="Do not measure peak memory.")
+    parser.add_argument('-o', '--output', type=str, default=None, help="Write JSON results to file [default: stdout].")
+    parser.add_argument('--compare', type=str, metavar='BASELINE', default=None, help=(
+        "Compare with saved JSON results, exit with 1 on throughput regressions."
+    ))
+    parser.add_argument('--threshold', type=float, default=0.2, help=(
+        "Allowed relative throughput drop, when comparing [default: 0.2]."
+    ))
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    stems = get_dictionary_stems(str(data / args.lang / 'hunspell.aff'), str(data / args.lang / 'hunspell.dic'))
+    words = random.Random(args.seed).sample(stems, min(args.words, len(stems)))
+    ctx = Context(data, args.lang, words)
+
+    results = OrderedDict()
+    for name in args.bench or BENCHMARKS:
+        print('%s...' % name, file=sys.stderr)
+        results[name] = run_benchmark(ctx, BENCHMARKS[name], len(words), not args.no_memory)
+
+    report = OrderedDict([
+        ('meta', OrderedDict([
+            ('python', platform.python_version()),
+            ('platform', platform.platform()),
+            ('language', args.lang),
+            ('words', len(words)),
+            ('seed', args.seed),
+        ])),
+        ('results', results),
+    ])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold):
+            return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""Time streaming lemmatization of running text, with and without the token cache.
+
+Text is generated from a sample of dictionary words, drawn with Zipf-like
+weights, so that some words repeat often, like in real text.
+
+    $ python benchmarks/text.py -n 20000
+"""
+
+import time
+import random
+import pathlib
+import argparse
+import tracemalloc
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.phrases import TextProcessor
+from gramtool.paradigms import get_dictionary_words
+
+
+def generate_text(words, ntokens, rand, chunk_size=1000):
+    """Yield text in chunks of about chunk_size words."""
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    for start in range(0, ntokens, chunk_size):
+        sample = rand.choices(words, weights, k=min(chunk_size, ntokens - start))
+        yield ' '.join(sample) + '.\n'
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--tokens', type=int, default=20000, help="Number of words in generated text.")
+    parser.add_argument('-w', '--words', type=int, default=5000, help="Number of distinct dictionary words.")
+    parser.add_argument('--spell-checker', choices=['hunspell', 'affixes'], default='hunspell', help=(
+        "Spell checker [default: hunspell]."
+    ))
+    parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    words = random.Random(args.seed).sample(get_dictionary_words(data, args.lang), args.words)
+    gt = gramtool.GramTool(data, args.lang, spell_checker=args.spell_checker)
+
+    # First pass looks up every distinct word, second pass over the same text shows repeated words.
+    for name, cache_size in [('no cache', 0), ('cache', 100000)]:
+        text = TextProcessor(gt, cache_size=cache_size)
+        gt.spell_cache.clear()
+        for run in ['cold', 'warm']:
+            chunks = generate_text(words, args.tokens, random.Random(args.seed))
+            tracemalloc.start()
+            start = time.perf_counter()
+            ntokens = sum(1 for token in text.lemmatize(chunks) if not token.isspace())
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('%-9s %s: %d tokens, %.0f tokens/s, peak memory %.1f MiB, %r' % (
+                name, run, ntokens, ntokens / elapsed, peak / 2 ** 20, text.analyses,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""Measure GramTool.get_lemma throughput, when one loaded grammar serves many threads.
+
+    $ python benchmarks/threads.py -n 2000 -t 1 -t 2 -t 4 -t 8
+"""
+
+import time
+import random
+import pathlib
+import argparse
+import threading
+
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.concurrent import ThreadLocalGramTool
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+def run(gt, words, nthreads, share_spell_cache):
+    tl = ThreadLocalGramTool(gt, share_spell_cache)
+    if share_spell_cache:
+        gt.spell_cache.clear()
+    barrier = threading.Barrier(nthreads + 1)
+
+    def worker(i):
+        tl.get()  # load thread hunspell outside of timed part
+        barrier.wait()
+        for word in words[i::nthreads]:
+            tl.get_lemma(word)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(nthreads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    data_dir = pres.resource_filename('gramtool', 'data')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
+    parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
+    parser.add_argument('-n', '--words', type=int, default=1000, help="Number of sampled words.")
+    parser.add_argument('-t', '--threads', type=int, action='append', help="Number of threads, can be repeated.")
+    parser.add_argument('--share-spell-cache', action='store_true', default=False, help=(
+        "Use one spell cache for all threads."
+    ))
+    parser.add_argument('--seed', type=int, default=0, help="Word sample random seed.")
+    args = parser.parse_args()
+
+    data = pathlib.Path(args.data_dir)
+    stems = get_dictionary_stems(str(data / args.lang / 'hunspell.aff'), str(data / args.lang / 'hunspell.dic'))
+    words = random.Random(args.seed).sample(stems, min(args.words, len(stems)))
+    gt = gramtool.GramTool(data, args.lang)
+
+    base = None
+    for nthreads in args.threads or [1, 2, 4, 8]:
+        elapsed = run(gt, words, nthreads, args.share_spell_cache)
+        throughput = len(words) / elapsed
+        base = base or throughput
+        print('%3d threads: %8.1f words/s, %.2fx' % (nthreads, throughput, throughput / base))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,68 +1,280 @@
+import gc
+import copy
 import pathlib
+import threading
 import pkg_resources as pres
 
+from collections import OrderedDict
+
 from gramtool.parser import get_grammar_rules
 from gramtool.utils.grammar import get_grammar_tree, get_frequency_list
 from gramtool.grammar import Grammar, change_spec
-from gramtool.hunspell import get_hunspell_dict
+from gramtool.cache import LRUCache
+from gramtool.lexicon import load_lexicon
+from gramtool.folding import FoldedIndex
+from gramtool.suggest import SuggestIndex
+from gramtool.snapshot import load_snapshot
+from gramtool.snapshot import load_frequency_table
+from gramtool.snapshot import load_spell_filter
+from gramtool.snapshot import load_stem_constraints
+from gramtool.utils.frequency import get_frequency_ranks
+from gramtool.utils.arrays import map_unique
 
 
 class GramTool(object):
 
-    def __init__(self, data_dir: pathlib.Path=None, language='lt'):
+    def __init__(self, data_dir: pathlib.Path=None, language='lt', spell_cache: LRUCache=None, snapshot=True,
+                 cache_dir: pathlib.Path=None, frequency_mmap=False, lexicon: pathlib.Path=None,
+                 spell_checker='hunspell', spell_filter: float=None, folded: pathlib.Path=None,
+                 suggest_index: pathlib.Path=None, stem_constraints=False):
         self.data_dir = data_dir or pathlib.Path(pres.resource_filename('gramtool', 'data'))
         self.language = language
-        self.symbols = get_grammar_tree(str(self.data_dir / 'grammar.yaml'))
+        self.spell_checker = spell_checker
+        self.spell_cache = LRUCache() if spell_cache is None else spell_cache
+        self.cache_dir = cache_dir
         self.hunspell = self._get_hunspell()
-        self.frequency = get_frequency_list(str(self.data_dir / self.language / 'frequency'))
-        self.grammar = self._get_grammar()
+        self.frequency = self._get_frequency(frequency_mmap)
+        self.lexicon = load_lexicon(self.data_dir, language, lexicon) if lexicon else None
+        self.folded = FoldedIndex(str(folded)) if folded else None
+        self.suggest_index = SuggestIndex(str(suggest_index)) if suggest_index else None
+        self.spell_filter = None
+        if spell_filter:
+            self.spell_filter = load_spell_filter(self.data_dir, language, spell_filter, cache_dir)
+        if snapshot:
+            self.symbols, self.grammar = self._load_grammar_snapshot()
+        else:
+            self.symbols = get_grammar_tree(str(self.data_dir / 'grammar.yaml'))
+            self.grammar = self._get_grammar()
+        if stem_constraints:
+            self.grammar.constraints = load_stem_constraints(self.data_dir, language, self.grammar.rules, cache_dir)
+
+    def copy(self, spell_cache: LRUCache=None):
+        """Return GramTool sharing loaded grammar, frequency list and lexicon.
+
+        Copy gets its own hunspell handle and, unless spell_cache is given,
+        its own spell cache, so that copies can be used from different threads.
+        Read-only affix dictionary is shared.
+        """
+        gt = copy.copy(self)
+        gt.spell_cache = LRUCache(self.spell_cache.maxsize) if spell_cache is None else spell_cache
+        if self.spell_checker == 'hunspell':
+            gt.hunspell = self._get_hunspell()
+        gt.grammar = self.grammar.bind(gt.hunspell, gt.spell_cache)
+        return gt
 
     def _get_hunspell(self):
         hunspell_dic_file = self.data_dir / self.language / 'hunspell.dic'
         hunspell_aff_file = self.data_dir / self.language / 'hunspell.aff'
-        return get_hunspell_dict(str(hunspell_aff_file), str(hunspell_dic_file))
+        if self.spell_checker == 'affixes':
+            from gramtool.affixes import get_affix_dict
+            return get_affix_dict(str(hunspell_aff_file), str(hunspell_dic_file))
+        elif self.spell_checker == 'hunspell':
+            # Imported here, so that hunspell C extension is only loaded, when it is needed.
+            from gramtool.hunspell import get_hunspell_dict
+            return get_hunspell_dict(str(hunspell_aff_file), str(hunspell_dic_file))
+        else:
+            raise ValueError("Unknown spell checker %r, use 'hunspell' or 'affixes'." % self.spell_checker)
+
+    def _get_frequency(self, mmap=False):
+        if mmap:
+            return load_frequency_table(self.data_dir, self.language, self.cache_dir)
+        else:
+            return get_frequency_ranks(get_frequency_list(str(self.data_dir / self.language / 'frequency')))
 
     def _get_grammar(self):
         rules_file = self.data_dir / self.language / 'grammar'
         rules = get_grammar_rules(self.symbols, str(rules_file))
-        return Grammar(self.hunspell, self.symbols, rules)
+        return Grammar(self.hunspell, self.symbols, rules, self.spell_cache, spell_filter=self.spell_filter)
+
+    def _load_grammar_snapshot(self):
+        snapshot = load_snapshot(self.data_dir, self.language, self.cache_dir)
+        symbols = snapshot['symbols']
+        grammar = Grammar(
+            self.hunspell, symbols, snapshot['rules'], self.spell_cache, snapshot['indexes'], self.spell_filter,
+        )
+        return symbols, grammar
+
+    def _resolve_folded(self, word):
+        # Words typed without diacritics (zmogaus) are replaced with most frequent real form (žmogaus).
+        if self.folded is not None:
+            return self.folded.resolve(word)
+        return word
 
-    def _get_word_lemma(self, word):
+    def _get_word_analyses(self, word):
+        word = self._resolve_folded(word)
+        if self.lexicon is not None:
+            entries = self.lexicon.get(word)
+            if entries:
+                return [(entry.lemma, entry.spec) for entry in entries]
+        return list(self.grammar.iter_analyses(word))
+
+    def get_analyses(self, word):
+        """Return all (lemma, spec) of a single word, most frequent lemma first."""
         result = []
-        for lemma, lexeme in self.grammar.iter_rules(word):
-            lemma = str(lemma)
-            try:
-                index = self.frequency.index(lemma)
-            except ValueError:
-                index = float('inf')
-            result.append((index, lemma))
+        for lemma, spec in self._get_word_analyses(word):
+            index = self.frequency.get(lemma, float('inf'))
+            result.append((index, lemma, spec))
+        result.sort(key=lambda r: r[:2])
+        return [(lemma, spec) for index, lemma, spec in result]
 
-        for index, lemma in sorted(result):
-            return lemma
+    def _analyze_word(self, word):
+        result = self.get_analyses(word)
+        if result:
+            return result[0]
+        else:
+            return None, None
 
-    def get_lemma(self, phrase):
-        words = phrase.split()
-        lemma = self._get_word_lemma(words[-1])
+    def analyze(self, phrase):
+        """Return (lemma, spec) of a phrase, spec is grammatical form of the last word.
+
+        Returns (None, None) for empty phrases and missing (None) values.
+        """
+        words = phrase.split() if phrase else []
+        if not words:
+            return None, None
+        lemma, spec = self._analyze_word(words[-1])
         if lemma:
-            return ' '.join(words[:-1] + [lemma])
+            return ' '.join(words[:-1] + [lemma]), spec
         else:
-            return None
+            return None, None
+
+    def get_lemma(self, phrase):
+        return self.analyze(phrase)[0]
+
+    def suggest(self, word, limit=10):
+        """Return known words closest to a misspelled word, closest and most frequent first."""
+        if self.suggest_index is None:
+            raise ValueError("Suggest index is not loaded, create GramTool with suggest_index.")
+        return [candidate for candidate, distance in self.suggest_index.suggest(word, limit=limit)]
+
+    def correct(self, phrase, candidates=5):
+        """Return (phrase, lemma), unknown last word of phrase is replaced with the closest suggestion.
+
+        Only suggestions, that have a lemma, are used. Phrase is returned unchanged with lemma None, if no
+        suggestion has a lemma. At most given number of candidates are analyzed.
+        """
+        lemma = self.get_lemma(phrase)
+        words = phrase.split()
+        if lemma is None and self.suggest_index is not None and words:
+            for candidate in self.suggest(words[-1], limit=candidates):
+                corrected = ' '.join(words[:-1] + [candidate])
+                lemma = self.get_lemma(corrected)
+                if lemma is not None:
+                    return corrected, lemma
+        return phrase, lemma
+
+    def get_corrected_lemma(self, phrase, candidates=5):
+        """Same as get_lemma, but unknown last word is replaced with the closest suggestion, that has a lemma."""
+        return self.correct(phrase, candidates)[1]
+
+    def analyze_many(self, phrases):
+        """Vectorized analyze, returns aligned (lemmas, specs) lists or NumPy arrays.
+
+        Each distinct phrase is analyzed only once.
+        """
+        return map_unique(self.analyze, phrases, n=2)
+
+    def get_lemmas(self, phrases):
+        return map_unique(self.get_lemma, phrases)
+
+    def change_forms(self, words, **kwargs):
+        return map_unique(lambda word: self.change_form(word, **kwargs), words)
+
+    def _iter_lexicon_form_tables(self, entries):
+        # Same as rule based lookup, for each rule its last form matching the word.
+        # Rules, that were removed from grammar since lexicon was built, are skipped.
+        tables = OrderedDict()
+        for entry in entries:
+            if entry.rule in self.grammar.rules:
+                tables[entry.rule, entry.stem] = entry.spec
+        for (rule, stem), spec in tables.items():
+            yield spec, {form.spec.lower(): form.get_word(stem) for form in self.grammar.rules[rule].forms.values()}
+
+    def iter_form_tables(self, word):
+        """Yield (spec, forms) of each inflection table word belongs to, in the order change_form tries them.
+
+        Spec is grammatical form of word, forms maps lower cased specs to all
+        forms of the table.
+        """
+        word = self._resolve_folded(word)
+        if self.lexicon is not None:
+            entries = self.lexicon.get(word)
+            if entries:
+                yield from self._iter_lexicon_form_tables(entries)
+                return
 
-    def change_form(self, word, **kwargs):
-        spec = None
         candidates = {}
         for stem, suffix, rule in self.grammar.find_rules(word):
-            forms = rule.build_forms(stem)
-            if self.grammar.check_spelling(forms):
+            spec = None
+            forms = list(rule.build_forms(stem))
+            if word in forms and self.grammar.check_forms(rule, forms):
                 for form in rule.forms.values():
                     candidate = form.get_word(stem)
                     if word == candidate:
                         spec = form.spec
                     candidates[form.spec.lower()] = candidate
                 if spec:
-                    return candidates[change_spec(self.symbols, spec, **kwargs).lower()]
+                    yield spec, candidates
+                    candidates = dict(candidates)
+
+    def change_form(self, word, **kwargs):
+        for spec, forms in self.iter_form_tables(word):
+            return forms.get(change_spec(self.symbols, spec, **kwargs).lower())
+
+
+_gt = None
+_gt_lock = threading.Lock()
+
+
+def preload(**kwargs):
+    """Create default GramTool instance now, instead of on first use.
+
+    Keyword arguments are passed to GramTool, but only if default instance is
+    not created yet.
+    """
+    global _gt
+    with _gt_lock:
+        if _gt is None:
+            _gt = GramTool(**kwargs)
+    return _gt
+
+
+def prefork(**kwargs):
+    """Load default GramTool in a parent process, before worker processes are forked.
+
+    Forked workers share loaded grammar and hunspell dictionary pages with the
+    parent, until they write to them. Garbage collection is disabled while
+    loading, so that freed temporary objects do not leave holes in shared
+    pages, that workers would then fill. Loaded objects are moved to the
+    permanent generation, so that full collections in workers do not touch
+    and copy them. Frequency ranks are memory mapped by default.
+    """
+    kwargs.setdefault('frequency_mmap', True)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        gt = preload(**kwargs)
+        gc.freeze()
+    finally:
+        if enabled:
+            gc.enable()
+    return gt
+
+
+def get_gramtool():
+    return _gt or preload()
+
+
+def get_lemma(phrase):
+    return get_gramtool().get_lemma(phrase)
+
+
+def change_form(word, **kwargs):
+    return get_gramtool().change_form(word, **kwargs)
 
 
-gt = GramTool()
-get_lemma = gt.get_lemma
-change_form = gt.change_form
+def __getattr__(name):
+    # gramtool.gt used to be created on import, keep it for backwards compatibility.
+    if name == 'gt':
+        return get_gramtool()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,197 @@
+import re
+import collections
+
+from gramtool.utils.dictionary import get_dic_encoding
+
+
+AffixEntry = collections.namedtuple('AffixEntry', 'flag cross strip add condition')
+
+# Directives changing spell checking in ways AffixDictionary does not implement.
+UNSUPPORTED = {
+    'FLAG', 'AF', 'COMPLEXPREFIXES', 'CIRCUMFIX', 'NEEDAFFIX', 'PSEUDOROOT', 'FORBIDDENWORD', 'KEEPCASE',
+    'ONLYINCOMPOUND', 'FULLSTRIP', 'ICONV', 'OCONV', 'IGNORE', 'CHECKSHARPS', 'BREAK', 'LANG',
+}
+
+NUMBER = re.compile(r'\d+$')
+
+
+def read_affixes(aff, encoding):
+    """Return (prefixes, suffixes), lists of AffixEntry from hunspell .aff file."""
+    prefixes = []
+    suffixes = []
+    with open(aff, encoding=encoding) as f:
+        lines = iter(f)
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            name = parts[0]
+            if name in UNSUPPORTED or name.startswith('COMPOUND'):
+                raise ValueError("%s: %s is not supported." % (aff, name))
+            if name not in ('PFX', 'SFX'):
+                continue
+
+            flag, cross, count = parts[1:4]
+            for i in range(int(count)):
+                parts = next(lines).split()
+                strip, add = parts[2:4]
+                condition = parts[4] if len(parts) > 4 else '.'
+                if '/' in add:
+                    raise ValueError("%s: affix continuation classes are not supported." % aff)
+                strip = '' if strip == '0' else strip
+                add = '' if add == '0' else add
+                if name == 'PFX':
+                    prefixes.append(AffixEntry(flag, cross == 'Y', strip, add, re.compile(condition)))
+                else:
+                    suffixes.append(AffixEntry(flag, cross == 'Y', strip, add, re.compile('(?:%s)$' % condition)))
+    return prefixes, suffixes
+
+
+def read_words(dic, encoding):
+    """Return dictionary words mapped to a tuple of flags of each homonym."""
+    words = {}
+    with open(dic, encoding=encoding) as f:
+        next(f)  # first line is the number of entries
+        for line in f:
+            word, sep, flags = line.strip().partition('/')
+            if word:
+                # Homonyms are kept apart, prefix and suffix must be allowed by the same entry.
+                words[word] = words.get(word, ()) + (flags,)
+    return words
+
+
+def index_affixes(entries):
+    """Index entries by added and then by stripped string.
+
+    Stem is built and looked up once for all entries with the same strip.
+    """
+    index = collections.defaultdict(lambda: collections.defaultdict(list))
+    for entry in entries:
+        index[entry.add][entry.strip].append(entry)
+    index = {add: list(strips.items()) for add, strips in index.items()}
+    return index, sorted({len(entry.add) for entry in entries})
+
+
+class AffixDictionary(object):
+    """Pure Python spell checker for hunspell dictionaries using only PFX and SFX rules.
+
+    Dictionary words are kept with their flags, a word is checked by stripping
+    matching prefixes and suffixes, same as hunspell does. Words are not
+    encoded and no C extension is called, so it can be used by Grammar in place
+    of HunSpell. Only spell is implemented. Compounding, continuation classes
+    and other .aff directives are not supported, ValueError is raised for them.
+    """
+
+    def __init__(self, aff, dic):
+        self.encoding = get_dic_encoding(aff)
+        self.words = read_words(dic, self.encoding)
+        prefixes, suffixes = read_affixes(aff, self.encoding)
+        self.prefixes, self.prefix_lengths = index_affixes(prefixes)
+        self.suffixes, self.suffix_lengths = index_affixes(suffixes)
+        self.prefix_flags = collections.defaultdict(list)
+        for entry in prefixes:
+            self.prefix_flags[entry.flag].append(entry)
+        self.suffix_flags = collections.defaultdict(list)
+        for entry in suffixes:
+            self.suffix_flags[entry.flag].append(entry)
+
+    def _check_suffix(self, word, prefix=None):
+        n = len(word)
+        for length in self.suffix_lengths:
+            if length >= n:
+                break
+            groups = self.suffixes.get(word[n - length:])
+            if groups is None:
+                continue
+            base = word[:n - length]
+            for strip, entries in groups:
+                stem = base + strip
+                homonyms = self.words.get(stem)
+                if homonyms is None:
+                    continue
+                for entry in entries:
+                    if (prefix is None or entry.cross) and entry.condition.search(stem):
+                        for flags in homonyms:
+                            if entry.flag in flags and (prefix is None or prefix in flags):
+                                return True
+        return False
+
+    def _check_prefix(self, word):
+        n = len(word)
+        for length in self.prefix_lengths:
+            if length >= n:
+                break
+            groups = self.prefixes.get(word[:length])
+            if groups is None:
+                continue
+            base = word[length:]
+            for strip, entries in groups:
+                stem = strip + base
+                homonyms = self.words.get(stem, ())
+                for entry in entries:
+                    if not entry.condition.match(stem):
+                        continue
+                    if any(entry.flag in flags for flags in homonyms):
+                        return True
+                    if entry.cross and self._check_suffix(stem, entry.flag):
+                        return True
+        return False
+
+    def check_word(self, word):
+        """Check exact word, without any case conversions."""
+        return word in self.words or self._check_suffix(word) or self._check_prefix(word)
+
+    def iter_words(self):
+        """Generate all words accepted by check_word, some of them more than once."""
+        for word, homonyms in self.words.items():
+            yield word
+            for flags in homonyms:
+                suffixed = []
+                for flag in flags:
+                    for entry in self.suffix_flags.get(flag, ()):
+                        if len(word) > len(entry.strip) and word.endswith(entry.strip) and entry.condition.search(word):
+                            form = word[:len(word) - len(entry.strip)] + entry.add
+                            yield form
+                            if entry.cross:
+                                suffixed.append(form)
+                for flag in flags:
+                    for entry in self.prefix_flags.get(flag, ()):
+                        strip = entry.strip
+                        if len(word) > len(strip) and word.startswith(strip) and entry.condition.match(word):
+                            yield entry.add + word[len(strip):]
+                        if entry.cross:
+                            for form in suffixed:
+                                if len(form) > len(strip) and form.startswith(strip) and entry.condition.match(form):
+                                    yield entry.add + form[len(strip):]
+
+    def _spell(self, word):
+        if self.check_word(word):
+            return True
+        # Like hunspell, empty words (also after breaking at dashes) are correct.
+        if not word.strip('-') or NUMBER.match(word):
+            return True
+
+        if word[0].isupper() and not any(c.isupper() for c in word[1:]):
+            if self.check_word(word.lower()):
+                return True
+        elif word.isupper():
+            if self.check_word(word.capitalize()) or self.check_word(word.lower()):
+                return True
+
+        # Hunspell default BREAK rules, words are broken at dashes.
+        if '-' in word:
+            parts = [part for part in word.split('-') if part]
+            return (len(parts) > 1 or word.strip('-') != word) and all(map(self._spell, parts))
+        return False
+
+    def spell(self, word):
+        # Same as HunSpell.spell, words not supported by dictionary encoding are misspelled.
+        try:
+            word.encode(self.encoding)
+        except UnicodeEncodeError:
+            return False
+        return self._spell(word) or self._spell(word.title())
+
+
+def get_affix_dict(aff, dic):
+    return AffixDictionary(aff, dic)
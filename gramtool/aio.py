@@ -0,0 +1,158 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from gramtool import GramTool
+from gramtool.concurrent import ThreadLocalGramTool
+
+
+class AsyncGramTool(object):
+    """asyncio front-end for GramTool.
+
+    Lookups run on a bounded thread pool, so they do not block the event loop.
+    Concurrent requests for the same word and arguments are coalesced into
+    one computation. Pending requests are grouped into micro-batches of up to
+    batch_size requests, one executor job per batch. At most max_pending
+    distinct requests are queued, further callers wait (backpressure).
+
+    A cancelled request is dropped, if no other caller waits for the same
+    result and its batch has not started yet. Lookups already running in a
+    thread are not interrupted.
+
+        >>> async with AsyncGramTool(gramtool.GramTool()) as agt:
+        ...     lemmas = await asyncio.gather(*[agt.get_lemma(w) for w in words])
+    """
+
+    def __init__(self, gt, max_workers=4, max_pending=1024, batch_size=64, batch_delay=0.0005):
+        if isinstance(gt, GramTool):
+            gt = ThreadLocalGramTool(gt)
+        self.gt = gt
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.pending = {}  # key -> [future, number of waiters]
+        self.loop = None
+        self.queue = None
+        self.workers = None
+        self.batcher = None
+        self.tasks = set()
+        self.computed = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _start(self):
+        if self.batcher is None:
+            self.loop = asyncio.get_running_loop()
+            self.queue = asyncio.Queue(self.max_pending)
+            self.workers = asyncio.Semaphore(self.max_workers)
+            self.batcher = self.loop.create_task(self._run_batcher())
+
+    async def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+            for task in list(self.tasks):
+                task.cancel()
+            await asyncio.gather(self.batcher, *self.tasks, return_exceptions=True)
+            self.batcher = None
+        for future, waiters in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
+
+    async def _call(self, method, *args, **kwargs):
+        self._start()
+        key = (method, args, tuple(sorted(kwargs.items())))
+        entry = self.pending.get(key)
+        if entry is None:
+            entry = self.pending[key] = [self.loop.create_future(), 0]
+            queued = False
+        else:
+            self.coalesced += 1
+            queued = True
+        future = entry[0]
+        entry[1] += 1
+        try:
+            if not queued:
+                try:
+                    await self.queue.put(key)
+                except asyncio.CancelledError:
+                    # Callers coalesced on this key still wait for it, so it is queued by a task no caller owns.
+                    if entry[1] > 1:
+                        self._add_task(self.queue.put(key))
+                    raise
+            return await asyncio.shield(future)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                if self.pending.get(key) is entry:
+                    del self.pending[key]
+                if not future.done():
+                    future.cancel()
+
+    async def _run_batcher(self):
+        while True:
+            keys = [await self.queue.get()]
+            self._drain(keys)
+            if len(keys) < self.batch_size and self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+                self._drain(keys)
+            await self.workers.acquire()
+            self._add_task(self._run_batch(keys))
+
+    def _add_task(self, coro):
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def _drain(self, keys):
+        while len(keys) < self.batch_size:
+            try:
+                keys.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    async def _run_batch(self, keys):
+        try:
+            # Skip requests cancelled while waiting in the queue.
+            keys = [key for key in keys if key in self.pending and not self.pending[key][0].done()]
+            if not keys:
+                return
+            self.batches += 1
+            self.computed += len(keys)
+            results = await self.loop.run_in_executor(self.executor, self._compute, keys)
+            for key, (error, value) in zip(keys, results):
+                entry = self.pending.get(key)
+                if entry is None or entry[0].done():
+                    continue
+                if error:
+                    entry[0].set_exception(value)
+                else:
+                    entry[0].set_result(value)
+        finally:
+            self.workers.release()
+
+    def _compute(self, keys):
+        results = []
+        for method, args, kwargs in keys:
+            try:
+                results.append((False, getattr(self.gt, method)(*args, **dict(kwargs))))
+            except Exception as e:
+                results.append((True, e))
+        return results
+
+    async def get_lemma(self, phrase):
+        return await self._call('get_lemma', phrase)
+
+    async def analyze(self, phrase):
+        return await self._call('analyze', phrase)
+
+    async def change_form(self, word, **kwargs):
+        return await self._call('change_form', word, **kwargs)
@@ -1,42 +1,52 @@
 # coding: utf-8
 
 import os.path
+import pathlib
 import pkg_resources as pres
 
-from gramtool.parser import get_grammar_rules
-from gramtool.utils.grammar import get_grammar_tree
 from gramtool.grammar import Grammar
 from gramtool.hunspell import get_hunspell_dict
+from gramtool.cache import LRUCache
+from gramtool.snapshot import load_snapshot
+from gramtool.lexicon import load_lexicon
+from gramtool.folding import FoldedIndex
 
 
 _dicts = {}
 
 
 class Wrapper(object):
-    def __init__(self, lang):
+    def __init__(self, lang, spell_cache=None, lexicon=None, folded=None):
         data_dir = pres.resource_filename('gramtool', 'data')
         data = lambda *args: os.path.join(data_dir, *args)  # noqa
 
-        grammar_file = data('grammar.yaml')
-        rules_file = data(lang, 'grammar')
         hunspell_dic_file = data(lang, 'hunspell.dic')
         hunspell_aff_file = data(lang, 'hunspell.aff')
 
-        self.tree = get_grammar_tree(grammar_file)
-        self.rules = get_grammar_rules(self.tree, rules_file)
+        snapshot = load_snapshot(pathlib.Path(data_dir), lang)
+        self.tree = snapshot['symbols']
+        self.rules = snapshot['rules']
         self.hunspell = get_hunspell_dict(hunspell_aff_file, hunspell_dic_file)
-        self.grammar = Grammar(self.hunspell, self.tree, self.rules)
+        self.spell_cache = LRUCache() if spell_cache is None else spell_cache
+        self.grammar = Grammar(self.hunspell, self.tree, self.rules, self.spell_cache, snapshot['indexes'])
+        self.lexicon = load_lexicon(pathlib.Path(data_dir), lang, lexicon) if lexicon else None
+        self.folded = FoldedIndex(str(folded)) if folded else None
 
 
-def load(lang):
+def load(lang, spell_cache=None, lexicon=None, folded=None):
     global _dicts
     if lang not in _dicts:
-        _dicts[lang] = Wrapper(lang)
+        _dicts[lang] = Wrapper(lang, spell_cache, lexicon, folded)
     return _dicts[lang]
 
 
 def _get_lemma(word, lang):
     d = load(lang)
+    if d.folded is not None:
+        word = d.folded.resolve(word)
+    if d.lexicon is not None:
+        for entry in d.lexicon.get(word):
+            return entry.lemma
     for lemma, lexeme in d.grammar.iter_rules(word):
         return lemma.form.get_word(lemma.stem)
 
@@ -0,0 +1,43 @@
+import json
+
+from collections import OrderedDict
+
+
+def iter_batch(gt, lines, correct=False, **change_form_kwargs):
+    """Yield results of non-empty lines.
+
+    With correct=True, unknown phrases are corrected with spelling suggestions
+    first, the corrected phrase is in 'corrected' column (empty, if phrase was
+    not changed) and lemma and form are of the corrected phrase.
+    """
+    for line in lines:
+        phrase = line.strip()
+        if not phrase:
+            continue
+        result = OrderedDict([('input', phrase)])
+        if correct:
+            corrected, lemma = gt.correct(phrase)
+            result['corrected'] = corrected if corrected != phrase else None
+            phrase = corrected
+        else:
+            lemma = gt.get_lemma(phrase)
+        result['lemma'] = lemma
+        if change_form_kwargs:
+            result['form'] = gt.change_form(phrase, **change_form_kwargs)
+        yield result
+
+
+def write_tsv(results, output):
+    for result in results:
+        output.write('\t'.join('' if v is None else v for v in result.values()) + '\n')
+
+
+def write_jsonl(results, output):
+    for result in results:
+        output.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+writers = {
+    'tsv': write_tsv,
+    'jsonl': write_jsonl,
+}
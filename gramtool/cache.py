@@ -0,0 +1,64 @@
+import threading
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Size bounded least recently used cache with hit/miss counters.
+
+    Falsy values (for example negative spell check results) are cached the
+    same way as truthy ones. With maxsize=None the cache is unbounded, with
+    maxsize=0 nothing is cached, only counted.
+
+    Cache is thread-safe, func is called outside of the lock, so the same key
+    can be computed by more than one thread at once.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return '<LRUCache hits=%d misses=%d size=%d maxsize=%s>' % (
+            self.hits, self.misses, len(self.data), self.maxsize,
+        )
+
+    def get(self, key, func):
+        with self.lock:
+            try:
+                value = self.data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.data.move_to_end(key)
+                return value
+
+        value = func(key)
+
+        if self.maxsize != 0:
+            with self.lock:
+                self.data[key] = value
+                if self.maxsize is not None and len(self.data) > self.maxsize:
+                    self.data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.data),
+            'maxsize': self.maxsize,
+        }
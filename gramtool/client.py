@@ -0,0 +1,73 @@
+import json
+import socket
+import urllib.request
+
+from gramtool.server import parse_address
+
+
+class ServerError(Exception):
+    pass
+
+
+class Client(object):
+    """Client of gramtool server, see gramtool.server.
+
+        >>> client = Client('unix:/tmp/gramtool.sock')
+        >>> client.lemma('žodžiai')
+        'žodis'
+        >>> client.batch([{'method': 'lemma', 'word': 'namo'}])
+        [{'result': 'namas'}]
+    """
+
+    def __init__(self, address, timeout=None):
+        self.kind, self.address = parse_address(address)
+        self.timeout = timeout
+        self.sock = None
+        self.rfile = None
+
+    def close(self):
+        if self.sock is not None:
+            self.rfile.close()
+            self.sock.close()
+            self.sock = self.rfile = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, request):
+        data = json.dumps(request, ensure_ascii=False).encode('utf-8')
+        if self.kind == 'unix':
+            if self.sock is None:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.settimeout(self.timeout)
+                self.sock.connect(self.address)
+                self.rfile = self.sock.makefile('rb')
+            self.sock.sendall(data + b'\n')
+            response = self.rfile.readline()
+        else:
+            url = 'http://%s:%d/' % self.address
+            req = urllib.request.Request(url, data, {'Content-Type': 'application/json'})
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                response = resp.read()
+        return json.loads(response.decode('utf-8'))
+
+    def batch(self, requests):
+        return self.request(list(requests))
+
+    def call(self, method, word, **kwargs):
+        response = self.request(dict(kwargs, method=method, word=word))
+        if 'error' in response:
+            raise ServerError(response['error'])
+        return response['result']
+
+    def lemma(self, word):
+        return self.call('lemma', word)
+
+    def change_form(self, word, **kwargs):
+        return self.call('change_form', word, **kwargs)
+
+    def forms(self, word):
+        return self.call('forms', word)
@@ -0,0 +1,44 @@
+import weakref
+import threading
+
+
+class ThreadLocalGramTool(object):
+    """Share one loaded GramTool between threads.
+
+    Grammar rules, indexes, symbols, frequency list, lexicon and folded index
+    are read-only after loading and are shared. Each thread gets its own
+    hunspell handle and spell cache (see GramTool.copy), created on first use
+    in that thread. With share_spell_cache=True all threads use the
+    thread-safe spell cache of the given GramTool instead. Once a thread has
+    finished, its copy is reused by the next new thread, so that servers
+    starting a thread per connection do not load hunspell for each of them.
+
+        >>> gt = ThreadLocalGramTool(gramtool.GramTool())
+        >>> with ThreadPoolExecutor(8) as executor:
+        ...     lemmas = list(executor.map(gt.get_lemma, words))
+    """
+
+    def __init__(self, gt, share_spell_cache=False):
+        self.gt = gt
+        self.share_spell_cache = share_spell_cache
+        self.local = threading.local()
+        self.free = []
+        # Loading hunspell dictionaries is not guaranteed to be thread-safe.
+        self.lock = threading.Lock()
+
+    def get(self):
+        gt = getattr(self.local, 'gt', None)
+        if gt is None:
+            # list.pop and list.append are atomic, free list is not locked, because copies
+            # are returned from a finalizer, that can run while this thread holds the lock.
+            try:
+                gt = self.free.pop()
+            except IndexError:
+                with self.lock:
+                    gt = self.gt.copy(self.gt.spell_cache if self.share_spell_cache else None)
+            self.local.gt = gt
+            weakref.finalize(threading.current_thread(), self.free.append, gt)
+        return gt
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
@@ -0,0 +1,80 @@
+from gramtool.affixes import AffixDictionary
+from gramtool.grammar import SuffixTrie
+
+
+# Rules, that dictionary words give at most this many stems for, get a stem whitelist.
+MAX_STEMS = 256
+# Number of final stem letters, that are checked.
+ENDING = 2
+
+
+class StemConstraint(object):
+    """Stems, that a rule can be used with, derived from all words of a hunspell dictionary.
+
+    All forms of a rule must pass spell checking, so a stem is only possible, if
+    the first form of the rule built with it is a dictionary word. Constraint
+    keeps minimum stem length, final letters of stems and, for rules with few
+    stems, all of them. Like SpellFilter, stems hunspell can accept without a
+    dictionary entry (with dashes, dots or numbers) always pass.
+    """
+
+    __slots__ = ('min_length', 'endings', 'stems')
+
+    def __init__(self, min_length=None, endings=(), stems=()):
+        self.min_length = min_length
+        self.endings = set(endings)
+        self.stems = None if stems is None else set(stems)
+
+    def __repr__(self):
+        return '<StemConstraint min_length=%s endings=%d stems=%s>' % (
+            self.min_length, len(self.endings), None if self.stems is None else len(self.stems),
+        )
+
+    def add(self, stem):
+        if self.min_length is None or len(stem) < self.min_length:
+            self.min_length = len(stem)
+        self.endings.add(stem[-ENDING:])
+        if self.stems is not None:
+            self.stems.add(stem)
+            if len(self.stems) > MAX_STEMS:
+                self.stems = None
+
+    def check(self, stem):
+        """Return False if no form of the rule with this stem can pass spell checking."""
+        if stem and not stem.isalpha():
+            return True
+        stem = stem.lower()
+        if self.min_length is None or len(stem) < self.min_length:
+            return False
+        if self.stems is not None:
+            return stem in self.stems
+        return stem[-ENDING:] in self.endings
+
+
+def build_stem_constraints(rules, words):
+    """Return {rule key: StemConstraint} of rules, derived from all accepted words.
+
+    Rules, whose forms all have a fixed stem, are not constrained.
+    """
+    firsts = {}
+    constraints = {}
+    for key, rule in rules.items():
+        form = next((form for form in rule.forms.values() if form.stem is None), None)
+        if form is not None:
+            firsts.setdefault(form.suffix, []).append((key, form.prefix))
+            constraints[key] = StemConstraint()
+    trie = SuffixTrie(sorted(firsts.items(), key=lambda item: len(item[0]), reverse=True))
+
+    for word in words:
+        word = word.lower()
+        for suffix, keys in trie.match(word):
+            for key, prefix in keys:
+                # Stem can be empty, irregular words list whole forms as suffixes.
+                if len(word) >= len(prefix) + len(suffix) and word.startswith(prefix):
+                    constraints[key].add(word[len(prefix):len(word) - len(suffix)])
+    return constraints
+
+
+def build_dictionary_constraints(rules, aff, dic):
+    """Expand all dictionary words with affix rules and derive stem constraints of rules from them."""
+    return build_stem_constraints(rules, AffixDictionary(aff, dic).iter_words())
@@ -0,0 +1,85 @@
+import struct
+import pathlib
+import unicodedata
+
+from gramtool.lexicon import Lexicon
+from gramtool.lexicon import get_lexicon_hash
+from gramtool.snapshot import atomic_write
+from gramtool.utils.grammar import get_frequency_list
+from gramtool.utils.frequency import get_frequency_ranks
+from gramtool.utils.mmaptable import MmapTable
+from gramtool.utils.mmaptable import write_table
+
+
+RECORD = struct.Struct('<I')  # length of folded index record
+
+
+def fold(word):
+    """Remove diacritics, žmogaus -> zmogaus."""
+    return ''.join(c for c in unicodedata.normalize('NFD', word) if not unicodedata.combining(c))
+
+
+def build_folded_index(lexicon, ranks):
+    """Map folded forms to real forms, from (form, [LexiconEntry]) pairs.
+
+    Real forms of each folded form are sorted by frequency rank of their most
+    frequent lemma. Folded forms, that are only spelled one way without
+    diacritics are left out, there is nothing to resolve for them.
+    """
+    candidates = {}
+    for form, entries in lexicon:
+        rank = min(ranks.get(entry.lemma, float('inf')) for entry in entries)
+        candidates.setdefault(fold(form), []).append((rank, form))
+
+    index = {}
+    for key, forms in candidates.items():
+        if any(form != key for rank, form in forms):
+            index[key] = [form for rank, form in sorted(forms)]
+    return index
+
+
+def write_folded_index(index, f):
+    items = []
+    data = bytearray()
+    for key, forms in sorted(index.items()):
+        record = '\n'.join(forms).encode('utf-8')
+        items.append((key.encode('utf-8'), len(data)))
+        data += RECORD.pack(len(record)) + record
+    write_table(FoldedIndex.magic, items, f, data)
+
+
+def compile_folded_index(data_dir: pathlib.Path, language, lexicon: pathlib.Path, path: pathlib.Path):
+    """Build folded index from a full form lexicon, written by compile_lexicon."""
+    ranks = get_frequency_ranks(get_frequency_list(str(data_dir / language / 'frequency')))
+    table = Lexicon(str(lexicon), get_lexicon_hash(data_dir, language))
+    try:
+        index = build_folded_index(table.items(), ranks)
+    finally:
+        table.close()
+    atomic_write(path, lambda f: write_folded_index(index, f))
+    return len(index)
+
+
+class FoldedIndex(MmapTable):
+    """Memory mapped folded form -> real forms index, written by compile_folded_index."""
+
+    magic = b'GTFOLD01'
+
+    def get(self, word):
+        offset = self.lookup(word.encode('utf-8'))
+        if offset is None:
+            return []
+        offset += self.data
+        length, = RECORD.unpack_from(self.mm, offset)
+        offset += RECORD.size
+        return self.mm[offset:offset + length].decode('utf-8').split('\n')
+
+    def resolve(self, word):
+        """Return most frequent real form of word typed without diacritics, or word itself.
+
+        Word is returned as is, if it is a real form itself.
+        """
+        forms = self.get(fold(word))
+        if forms and word not in forms:
+            return forms[0]
+        return word
@@ -1,32 +1,57 @@
+import sys
 import logging
 
 from collections import defaultdict
 from collections import OrderedDict
 
+from gramtool.symbols import get_symbol_table
+
 
 logger = logging.getLogger(__name__)
 
 
 class Form(object):
-    def __init__(self, rule, spec, level, stem=None):
-        self.rule = rule
-        self.spec = spec
-        self.prefixes = []
-        self.suffixes = []
-        self.level = level
-        self.stem = stem
+    # Forms are immutable records. Affixes are joined once and all strings
+    # are interned, so that identical specs and affixes are shared between
+    # all rules. Affix parts are kept as tuples for index building and
+    # include expansion.
+    __slots__ = ('rule', 'spec', 'prefixes', 'suffixes', 'prefix', 'suffix', 'level', 'stem')
+
+    def __init__(self, rule, spec, level, stem=None, prefixes=(), suffixes=()):
+        prefixes = tuple(sys.intern(p) for p in prefixes)
+        suffixes = tuple(sys.intern(s) for s in suffixes)
+        init = super().__setattr__
+        init('rule', rule)
+        init('spec', sys.intern(spec))
+        init('prefixes', prefixes)
+        init('suffixes', suffixes)
+        init('prefix', sys.intern(''.join(prefixes)))
+        init('suffix', sys.intern(''.join(suffixes)))
+        init('level', level)
+        init('stem', stem)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Form is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Form is immutable.")
+
+    def __reduce__(self):
+        return Form, (self.rule, self.spec, self.level, self.stem, self.prefixes, self.suffixes)
 
     def get_word(self, stem):
-        return ''.join(self.prefixes) + (self.stem or stem) + ''.join(self.suffixes)
+        return self.prefix + (self.stem or stem) + self.suffix
 
 
 class Rule(object):
+    __slots__ = ('lineno', 'key', 'name', 'macro', 'forms', 'includes')
+
     def __init__(self, lineno, key, name, macro=False):
         self.lineno = lineno
         self.key = key
         self.name = name
         self.macro = macro
-        self.forms = OrderedDict()
+        self.forms = {}  # dicts keep insertion order and are smaller than OrderedDict
         self.includes = defaultdict(list)
 
     def __str__(self):
@@ -43,22 +68,68 @@ class Rule(object):
             yield form.get_word(stem)
 
 
+class SuffixTrie(object):
+    """Reversed suffix trie, finds all suffixes of a word in O(len(word))."""
+
+    def __init__(self, suffixes=()):
+        self.root = {}
+        for suffix, value in suffixes:
+            self.add(suffix, value)
+
+    def add(self, suffix, value):
+        node = self.root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[None] = (suffix, value)
+
+    def match(self, word):
+        # Longest suffix first, same order as Grammar.suffixes.
+        node = self.root
+        result = [node[None]] if None in node else []
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                result.append(node[None])
+        result.reverse()
+        return result
+
+
 class Grammar(object):
-    def __init__(self, hs, tree, rules):
+    def __init__(self, hs, tree, rules, spell_cache=None, indexes=None, spell_filter=None, form_order=None,
+                 constraints=None):
         self.hs = hs
         self.tree = tree
         self.rules = rules
-        self.stems, self.suffixes = self.create_indexes(rules)
+        self.spell_cache = spell_cache
+        self.spell_filter = spell_filter
+        # Rule key -> StemConstraint, see gramtool.constraints.
+        self.constraints = constraints
+        # Rule key -> (reject counts, order of form indexes), see check_forms.
+        self.form_order = {} if form_order is None else form_order
+        if indexes is None:
+            self.stems, self.suffixes = self.create_indexes(rules)
+            self.suffix_trie = SuffixTrie(self.suffixes)
+        else:
+            self.stems, self.suffixes, self.suffix_trie = indexes
+
+    def bind(self, hs, spell_cache=None):
+        """Return grammar sharing rules, indexes and form order, but using given hunspell and spell cache."""
+        return Grammar(
+            hs, self.tree, self.rules, spell_cache, (self.stems, self.suffixes, self.suffix_trie), self.spell_filter,
+            self.form_order, self.constraints,
+        )
 
     def find_rules(self, word):
         for rule in self.stems.get(word, []):
             yield word, '', self.rules[rule]
 
-        for suffix, rules in self.suffixes:
-            if word.endswith(suffix):
-                if suffix != '':
-                    stem = word[:-len(suffix)]
-                for rule in rules:
+        constraints = self.constraints
+        for suffix, rules in self.suffix_trie.match(word):
+            stem = word[:-len(suffix)] if suffix else word
+            for rule in rules:
+                if constraints is None or rule not in constraints or constraints[rule].check(stem):
                     yield stem, suffix, self.rules[rule]
 
     def create_indexes(self, rules):
@@ -77,28 +148,68 @@ class Grammar(object):
         suffixes = sorted(suffixes.items(), key=sort_by_len, reverse=True)
         return stems, suffixes
 
+    def spell(self, word):
+        if self.spell_filter is not None and not self.spell_filter.check(word):
+            return False
+        if self.spell_cache is None:
+            return self.hs.spell(word)
+        else:
+            return self.spell_cache.get(word, self.hs.spell)
+
     def check_spelling(self, words):
         for word in words:
-            if not self.hs.spell(word):
+            if not self.spell(word):
                 logger.debug("  %s is not supported by hunspell", word)
                 return False
         return True
 
-    def iter_rules(self, word):
+    def check_forms(self, rule, forms):
+        """Spell check forms of rule, as returned by build_forms, forms that rejected most often first.
+
+        Most candidate rules are rejected, so checking the form, that is
+        most likely to fail, first saves spell checks of the other forms.
+        Reject counts are learned per rule, ties keep declaration order.
+        """
+        counts, order = self.form_order.get(rule.key) or (None, range(len(forms)))
+        for pos, i in enumerate(order):
+            if not self.spell(forms[i]):
+                logger.debug("  %s is not supported by hunspell", forms[i])
+                if counts is None:
+                    counts, order = [0] * len(forms), tuple(order)
+                    self.form_order[rule.key] = counts, order
+                counts[i] += 1
+                # Form moves one place up, once it rejected more often than the one before it. Order
+                # is replaced, not changed in place, so that it stays valid in other threads.
+                if pos > 0 and counts[i] > counts[order[pos - 1]]:
+                    order = order[:pos - 1] + (i, order[pos - 1]) + order[pos + 1:]
+                    self.form_order[rule.key] = counts, order
+                return False
+        return True
+
+    def _iter_matches(self, word):
+        # Yields (stem, rule, forms, form) of rules producing word, forms are all words built by the rule.
         for stem, suffix, rule in self.find_rules(word):
             logger.debug("rule: %s", rule.name)
-            forms = rule.build_forms(stem)
-            if self.check_spelling(forms):
-                lemma = None
-                for form in rule.forms.values():
-                    _word = form.get_word(stem)
-                    if lemma is None:
-                        lemma = Word(form, stem)
+            forms = list(rule.build_forms(stem))
+            # Suffix match alone does not mean, that rule produces the word, this is checked without hunspell.
+            if word in forms and self.check_forms(rule, forms):
+                for form, _word in zip(rule.forms.values(), forms):
                     if _word == word:
-                        yield lemma, Word(form, stem)
+                        yield stem, rule, forms, form
+
+    def iter_rules(self, word):
+        for stem, rule, forms, form in self._iter_matches(word):
+            yield Word(next(iter(rule.forms.values())), stem), Word(form, stem)
+
+    def iter_analyses(self, word):
+        """Same as iter_rules, but yields (lemma, spec) strings, without allocating Word objects."""
+        for stem, rule, forms, form in self._iter_matches(word):
+            yield forms[0], form.spec
 
 
 class Word(object):
+    __slots__ = ('form', 'stem')
+
     def __init__(self, form, stem):
         self.form = form
         self.stem = stem
@@ -114,57 +225,12 @@ class Word(object):
 
 
 def check_spec(symbols, spec, **kwargs):
-    pos = symbols['pos'][spec[0]]
-    properties = ['pos'] + symbols['grammar'][pos]
-    for key, value in kwargs.items():
-        if key in properties:
-            code = spec[properties.index(key)]
-            name = symbols[key][code]
-            if value not in symbols[key].values():
-                raise ValueError("Unknown symbol '%s' of '%s'." % (value, key))
-            elif name not in (value, value + '-only'):
-                return False
-        elif key not in symbols:
-            raise ValueError("Unknown symbol '%s'." % key)
-    return True
+    return get_symbol_table(symbols).check_spec(spec, kwargs)
 
 
 def change_spec(symbols, spec, **kwargs):
-    spec = list(spec)
-    pos = symbols['pos'][spec[0]]
-    properties = ['pos'] + symbols['grammar'][pos]
-    for key, value in kwargs.items():
-        if key in properties:
-            idx = properties.index(key)
-            for k, v in symbols[key].items():
-                if v == value:
-                    spec[idx] = k
-                    break
-            else:
-                raise ValueError("Unknown symbol '%s' of '%s'." % (value, key))
-        elif key not in symbols:
-            raise ValueError("Unknown symbol '%s'." % key)
-    return ''.join(spec)
+    return get_symbol_table(symbols).change_spec(spec, kwargs)
 
 
 def get_properties(symbols, spec):
-    spec = list(spec)
-    try:
-        pos = symbols['pos'][spec[0]]
-    except KeyError:
-        raise ValueError("Unknown symbol %r of 'pos'." % spec[0])
-    except IndexError:
-        raise ValueError("Unknown 'pos' symbol.")
-    properties = OrderedDict([('pos', pos)])
-    for i, prop in enumerate(symbols['grammar'][pos], 1):
-        try:
-            symbol = spec[i]
-        except IndexError:
-            raise ValueError("Unknown %r symbol." % prop)
-        try:
-            value = symbols[prop][symbol]
-        except KeyError:
-            raise ValueError("Unknown symbol %r of %r." % (symbol, prop))
-        value = value.replace('-only', '')
-        properties[prop] = value
-    return properties
+    return OrderedDict(get_symbol_table(symbols).get_properties(spec))
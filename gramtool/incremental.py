@@ -0,0 +1,127 @@
+import os
+import time
+import logging
+
+from collections import defaultdict
+
+from gramtool.parser import Parser
+from gramtool.validator import GrammarSyntaxError
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_rule_sources(parser):
+    """Return source lines of each rule, without comments and empty lines."""
+    rules = sorted(parser.rules.items(), key=lambda item: item[1].lineno)
+    sources = {}
+    for i, (key, rule) in enumerate(rules):
+        end = rules[i + 1][1].lineno - 1 if i + 1 < len(rules) else len(parser.lines)
+        lines = (parser.strip_comments(line) for line in parser.lines[rule.lineno - 1:end])
+        sources[key] = tuple(line for line in lines if line)
+    return sources
+
+
+def get_rule_dependencies(rules):
+    """Return keys of rules, that each rule includes directly."""
+    dependencies = {}
+    for key, rule in rules.items():
+        dependencies[key] = {
+            include[2]
+            for includes in rule.includes.values()
+            for include in includes
+            if include[2] not in ('.', '@')
+        }
+    return dependencies
+
+
+def get_dependents(dependencies, keys):
+    """Return given keys and keys of all rules, that include them directly or indirectly."""
+    dependents = defaultdict(set)
+    for key, includes in dependencies.items():
+        for include in includes:
+            dependents[include].add(key)
+
+    result = set()
+    stack = list(keys)
+    while stack:
+        key = stack.pop()
+        if key not in result:
+            result.add(key)
+            stack.extend(dependents[key])
+    return result
+
+
+class RuleCompiler(object):
+    """Compiles grammar rules, recompiling only what has changed.
+
+    Whole file is parsed and validated each time, that is cheap. Includes are
+    expanded only for changed rules and rules, that include them directly or
+    through other rules and macros. Other rules are reused from the previous
+    compilation.
+    """
+
+    def __init__(self, tree, filename, strict=True):
+        self.tree = tree
+        self.filename = filename
+        self.strict = strict
+        self.rules = None  # all rules of the last compilation, including macros
+        self.sources = {}
+        self.expanded = set()  # keys of rules expanded by the last compilation
+
+    def compile(self, f=None):
+        """Return expanded rules, like Parser.parse does."""
+        parser = Parser(self.tree, self.strict)
+        if f is None:
+            with open(self.filename) as f:
+                parser.parse_rules(f, self.filename)
+        else:
+            parser.parse_rules(f, self.filename)
+
+        sources = get_rule_sources(parser)
+        if self.rules is None:
+            changed = set(sources)
+        else:
+            changed = {key for key, source in sources.items() if self.sources.get(key) != source}
+            changed.update(set(self.sources) - set(sources))
+        affected = get_dependents(get_rule_dependencies(parser.rules), changed)
+
+        for key, rule in parser.rules.items():
+            if key not in affected:
+                # Unchanged rule is already expanded, only its position in the file could have changed.
+                old = self.rules[key]
+                old.lineno = rule.lineno
+                old.key = rule.key
+                parser.rules[key] = old
+
+        rules = parser.process_includes(affected)
+        self.rules = parser.rules
+        self.sources = sources
+        self.expanded = affected & set(rules)
+        return rules
+
+
+def watch(compiler, callback, interval=0.5):
+    """Recompile rules, each time grammar file changes and pass them to callback.
+
+    Syntax errors are logged and previous rules are kept, until file is fixed.
+    """
+    mtime = None
+    while True:
+        try:
+            current = os.stat(compiler.filename).st_mtime_ns
+        except FileNotFoundError:
+            current = None
+        if current is not None and current != mtime:
+            mtime = current
+            start = time.perf_counter()
+            try:
+                rules = compiler.compile()
+            except GrammarSyntaxError as e:
+                logger.error(e.format_error())
+            else:
+                callback(rules)
+                logger.info("Recompiled %d of %d rules in %.1f ms.", len(compiler.expanded), len(rules), (
+                    (time.perf_counter() - start) * 1000
+                ))
+        time.sleep(interval)
@@ -0,0 +1,106 @@
+import struct
+import logging
+import pathlib
+
+from collections import OrderedDict
+from collections import namedtuple
+
+from gramtool.snapshot import atomic_write
+from gramtool.snapshot import get_source_hash
+from gramtool.snapshot import get_source_files
+from gramtool.paradigms import generate_paradigms
+from gramtool.utils.mmaptable import MmapTable
+from gramtool.utils.mmaptable import write_table
+
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct('<I')  # length of lexicon record
+HASH_SIZE = 64  # hex sha256 of sources, at the start of lexicon data
+
+LexiconEntry = namedtuple('LexiconEntry', 'lemma spec rule stem')
+
+
+def build_lexicon(data_dir: pathlib.Path, language, jobs=None, chunksize=200, words=None):
+    """Expand all hunspell dictionary words (or given words) through all grammar rules, using a process pool.
+
+    Returns full form -> [LexiconEntry] mapping, in deterministic order.
+    """
+    lexicon = OrderedDict()
+    for word, paradigms in generate_paradigms(data_dir, language, words, jobs=jobs, chunksize=chunksize):
+        for rule, stem, forms in paradigms:
+            lemma = forms[0][1]
+            for spec, form_word in forms:
+                entry = LexiconEntry(lemma, spec, rule, stem)
+                form_entries = lexicon.setdefault(form_word, [])
+                if entry not in form_entries:
+                    form_entries.append(entry)
+    return lexicon
+
+
+def get_lexicon_hash(data_dir: pathlib.Path, language):
+    """Return hash of grammar and hunspell dictionary, that lexicon is built from."""
+    aff = data_dir / language / 'hunspell.aff'
+    dic = data_dir / language / 'hunspell.dic'
+    return get_source_hash(get_source_files(data_dir, language) + [aff, dic])
+
+
+def write_lexicon(lexicon, f, source_hash):
+    items = []
+    data = bytearray(source_hash.encode('ascii'))
+    for form_word, entries in lexicon.items():
+        record = '\n'.join('\t'.join(entry) for entry in entries).encode('utf-8')
+        items.append((form_word.encode('utf-8'), len(data)))
+        data += RECORD.pack(len(record)) + record
+    write_table(Lexicon.magic, items, f, data)
+
+
+def compile_lexicon(data_dir: pathlib.Path, language, path: pathlib.Path, jobs=None):
+    lexicon = build_lexicon(data_dir, language, jobs)
+    source_hash = get_lexicon_hash(data_dir, language)
+    atomic_write(path, lambda f: write_lexicon(lexicon, f, source_hash))
+    return len(lexicon)
+
+
+def load_lexicon(data_dir: pathlib.Path, language, path: pathlib.Path):
+    """Return Lexicon, or None, if grammar or hunspell dictionary has changed since it was built."""
+    lexicon = Lexicon(str(path))
+    if lexicon.source_hash != get_lexicon_hash(data_dir, language):
+        logger.warning("Ignoring stale lexicon %s, grammar or dictionary has changed, rebuild it.", path)
+        lexicon.close()
+        return None
+    return lexicon
+
+
+class Lexicon(MmapTable):
+    """Memory mapped full form lexicon, written by compile_lexicon.
+
+    If source_hash is given, lexicon built from different sources is rejected.
+    """
+
+    magic = b'GTLEXI02'
+
+    def __init__(self, filename, source_hash=None):
+        super().__init__(filename)
+        self.source_hash = self.mm[self.data:self.data + HASH_SIZE].decode('ascii')
+        if source_hash is not None and self.source_hash != source_hash:
+            self.close()
+            raise ValueError("%s is stale, grammar or dictionary has changed since it was built." % filename)
+
+    def get(self, word):
+        offset = self.lookup(word.encode('utf-8'))
+        if offset is None:
+            return []
+        return self._read_entries(offset)
+
+    def items(self):
+        """Yield (form, [LexiconEntry]) of all forms."""
+        for key, offset in super().items():
+            yield key.decode('utf-8'), self._read_entries(offset)
+
+    def _read_entries(self, offset):
+        offset += self.data
+        length, = RECORD.unpack_from(self.mm, offset)
+        offset += RECORD.size
+        record = self.mm[offset:offset + length].decode('utf-8')
+        return [LexiconEntry(*line.split('\t')) for line in record.split('\n')]
@@ -1,10 +1,21 @@
+import io
+import sys
 import logging
 import pathlib
 import argparse
 import pkg_resources as pres
 
 from gramtool.views import print_forms, print_all_forms
+from gramtool.batch import iter_batch, writers
 from gramtool.exceptions import UserSideError
+from gramtool.snapshot import compile_grammar
+from gramtool.lexicon import compile_lexicon
+from gramtool.folding import compile_folded_index
+from gramtool.suggest import compile_suggest_index
+from gramtool.paradigms import generate_paradigms, iter_paradigm_rows
+from gramtool.server import serve
+from gramtool.grammar import Grammar
+from gramtool.incremental import RuleCompiler, watch
 
 import gramtool
 
@@ -13,14 +24,64 @@ def main():
     data_dir = pres.resource_filename('gramtool', 'data')
 
     parser = argparse.ArgumentParser()
-    parser.add_argument('word', type=str, help="A lexeme from morphology database.")
+    parser.add_argument('word', type=str, nargs='?', help="A lexeme from morphology database.")
     parser.add_argument('-d', '--data-dir', type=str, default=data_dir, help="Data directory.")
     parser.add_argument('-l', '--lang', type=str, default='lt', help="Two letter language code [default: lt].")
     parser.add_argument('-f', '--forms', action='store_true', default=False, help="Print all <word> forms.")
     parser.add_argument('--debug', action='store_true', default=False, help="Print debug information.")
+    parser.add_argument('--compile', action='store_true', default=False, help=(
+        "Compile grammar snapshot, used to speed up grammar loading."
+    ))
+    parser.add_argument('--cache-dir', type=str, default=None, help="Grammar snapshot directory.")
+    parser.add_argument('--build-lexicon', type=str, metavar='FILE', default=None, help=(
+        "Expand all dictionary words through all rules and save full form lexicon to FILE."
+    ))
+    parser.add_argument('--lexicon', type=str, metavar='FILE', default=None, help=(
+        "Use full form lexicon, created with --build-lexicon."
+    ))
+    parser.add_argument('--build-folded', type=str, metavar='FILE', default=None, help=(
+        "Save index of forms without diacritics, built from --lexicon FILE, to FILE."
+    ))
+    parser.add_argument('--folded', type=str, metavar='FILE', default=None, help=(
+        "Resolve words typed without diacritics, using index created with --build-folded."
+    ))
+    parser.add_argument('--build-suggest', type=str, metavar='FILE', default=None, help=(
+        "Save spelling suggestion index of dictionary words and, with --lexicon FILE, of all their forms to FILE."
+    ))
+    parser.add_argument('--suggest', type=str, metavar='FILE', default=None, help=(
+        "Print spelling suggestions for <word> and correct unknown words in --batch, using index created "
+        "with --build-suggest."
+    ))
+    parser.add_argument('--spell-checker', choices=['hunspell', 'affixes'], default='hunspell', help=(
+        "Spell check generated forms with hunspell or with pure Python affix dictionary [default: hunspell]."
+    ))
+    parser.add_argument('--spell-filter', type=float, metavar='RATE', default=None, help=(
+        "Reject unknown forms with a Bloom filter, with given false positive rate (for example 0.01), "
+        "before calling spell checker. With --compile, the filter is built ahead of time."
+    ))
+    parser.add_argument('--stem-constraints', action='store_true', default=False, help=(
+        "Drop candidate rules, whose stem does not occur with them in the dictionary, before spell checking. "
+        "With --compile, the constraints are built ahead of time."
+    ))
+    parser.add_argument('--watch', action='store_true', default=False, help=(
+        "Recompile grammar each time grammar file changes and print <word> forms again."
+    ))
+    parser.add_argument('--paradigms', action='store_true', default=False, help=(
+        "Print inflection tables of <word>, of words from --batch FILE or of all dictionary words, "
+        "generated on a process pool."
+    ))
+    parser.add_argument('--serve', type=str, metavar='ADDRESS', default=None, help=(
+        "Run gramtool server on unix:/path/to/socket or host:port (HTTP) address."
+    ))
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Number of worker processes [default: CPU count].")
 
     parser.add_argument('--case', type=str, default=None, help="Change case of given <word>.")
 
+    parser.add_argument('-b', '--batch', type=str, metavar='FILE', default=None, help=(
+        "Read words or phrases, one per line, from FILE ('-' for stdin) and print their lemmas."
+    ))
+    parser.add_argument('--format', choices=sorted(writers), default='tsv', help="Batch output format [default: tsv].")
+
     args = parser.parse_args()
 
     if args.debug:
@@ -28,8 +89,54 @@ def main():
     else:
         logging.basicConfig(format="%(asctime)s %(levelname)s: %(message)s", level=logging.INFO)
 
+    data_dir = pathlib.Path(args.data_dir)
+    cache_dir = pathlib.Path(args.cache_dir) if args.cache_dir else None
+
+    if args.compile:
+        try:
+            path = compile_grammar(data_dir, args.lang, cache_dir, args.spell_filter, args.stem_constraints)
+        except UserSideError as e:
+            print(e)
+            return 1
+        print(path)
+        return
+
+    if args.build_lexicon:
+        try:
+            size = compile_lexicon(data_dir, args.lang, pathlib.Path(args.build_lexicon), args.jobs)
+        except UserSideError as e:
+            print(e)
+            return 1
+        print('%s: %d forms' % (args.build_lexicon, size))
+        return
+
+    if args.build_folded:
+        if not args.lexicon:
+            parser.error("--build-folded requires --lexicon")
+        size = compile_folded_index(data_dir, args.lang, pathlib.Path(args.lexicon), pathlib.Path(args.build_folded))
+        print('%s: %d forms' % (args.build_folded, size))
+        return
+
+    if args.build_suggest:
+        size = compile_suggest_index(
+            data_dir, args.lang, pathlib.Path(args.build_suggest), pathlib.Path(args.lexicon) if args.lexicon else None,
+        )
+        print('%s: %d words' % (args.build_suggest, size))
+        return
+
+    if args.paradigms:
+        run_paradigms(data_dir, args.lang, args.word, args.batch, args.format, args.jobs)
+        return
+
+    if args.word is None and args.batch is None and args.serve is None and not args.watch:
+        parser.error("the following arguments are required: word, --batch or --serve")
+
     try:
-        gt = gramtool.GramTool(pathlib.Path(args.data_dir), args.lang)
+        gt = gramtool.GramTool(
+            data_dir, args.lang, cache_dir=cache_dir, lexicon=args.lexicon, spell_checker=args.spell_checker,
+            spell_filter=args.spell_filter, folded=args.folded, suggest_index=args.suggest,
+            stem_constraints=args.stem_constraints,
+        )
     except UserSideError as e:
         print(e)
         return 1
@@ -39,9 +146,66 @@ def main():
     }
     change_form_kwargs = {k: v for k, v in change_form_kwargs.items() if v}
 
-    if change_form_kwargs:
-        print(gramtool.change_form(args.word, **change_form_kwargs))
+    if args.watch:
+        run_watch(gt, args.word, args.forms)
+    elif args.serve:
+        serve(gt, args.serve)
+    elif args.batch:
+        run_batch(gt, args.batch, args.format, change_form_kwargs, correct=bool(args.suggest))
+    elif change_form_kwargs:
+        print(gt.change_form(args.word, **change_form_kwargs))
+    elif args.suggest:
+        for candidate, distance in gt.suggest_index.suggest(args.word):
+            print('%s %d' % (candidate, distance))
     else:
         print_forms(gt.grammar, args.word)
         if args.forms:
             print_all_forms(gt.grammar, args.word)
+
+
+def open_input(filename):
+    if filename == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    else:
+        return open(filename, encoding='utf-8')
+
+
+def open_output():
+    # Line buffering for interactive use, otherwise write output in large blocks.
+    return open(sys.stdout.fileno(), 'w', encoding='utf-8', closefd=False,
+                buffering=1 if sys.stdout.isatty() else 1 << 16)
+
+
+def run_batch(gt, filename, fmt, change_form_kwargs, correct=False):
+    with open_input(filename) as lines, open_output() as output:
+        results = iter_batch(gt, lines, correct, **change_form_kwargs)
+        writers[fmt](results, output)
+
+
+def run_watch(gt, word, forms):
+    compiler = RuleCompiler(gt.symbols, str(gt.data_dir / gt.language / 'grammar'))
+
+    def update(rules):
+        gt.grammar = Grammar(gt.hunspell, gt.symbols, rules, gt.spell_cache, spell_filter=gt.spell_filter)
+        if word:
+            print_forms(gt.grammar, word)
+            if forms:
+                print_all_forms(gt.grammar, word)
+
+    try:
+        watch(compiler, update)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_paradigms(data_dir, language, word, filename, fmt, jobs):
+    with open_output() as output:
+        if word:
+            words = [word]
+        elif filename:
+            with open_input(filename) as lines:
+                words = [line.strip() for line in lines if line.strip()]
+        else:
+            words = None
+        paradigms = generate_paradigms(data_dir, language, words, jobs)
+        writers[fmt](iter_paradigm_rows(paradigms), output)
@@ -0,0 +1,80 @@
+import pathlib
+import multiprocessing
+
+from collections import OrderedDict
+
+from gramtool.utils.dictionary import get_dictionary_stems
+
+
+def iter_word_paradigms(grammar, word):
+    """Yield (stem, rule) of all rules, that can produce given word and pass spell checking."""
+    for stem, suffix, rule in grammar.find_rules(word):
+        if grammar.check_forms(rule, list(rule.build_forms(stem))):
+            yield stem, rule
+
+
+def get_paradigms(grammar, word):
+    """Return all inflection tables of word, as a list of (rule name, stem, [(spec, form), ...])."""
+    return [
+        (str(rule), stem, [(form.spec, form.get_word(stem)) for form in rule.forms.values()])
+        for stem, rule in iter_word_paradigms(grammar, word)
+    ]
+
+
+def get_dictionary_words(data_dir: pathlib.Path, language):
+    aff = data_dir / language / 'hunspell.aff'
+    dic = data_dir / language / 'hunspell.dic'
+    return sorted(set(get_dictionary_stems(str(aff), str(dic))))
+
+
+_grammar = None
+
+
+def _init_worker(data_dir, language):
+    global _grammar
+    from gramtool import GramTool
+    _grammar = GramTool(data_dir, language).grammar
+
+
+def _get_chunk_paradigms(words):
+    return [(word, get_paradigms(_grammar, word)) for word in words]
+
+
+def generate_paradigms(data_dir: pathlib.Path, language, words=None, jobs=None, chunksize=200):
+    """Generate inflection tables of words on a process pool.
+
+    Words are split into chunks and sent to worker processes, each of them
+    loads grammar once. Yields (word, paradigms) in the same order as given
+    words, by default all hunspell dictionary words, sorted.
+    """
+    if words is None:
+        words = get_dictionary_words(data_dir, language)
+
+    with multiprocessing.Pool(jobs, _init_worker, (data_dir, language)) as pool:
+        for chunk in pool.imap(_get_chunk_paradigms, _iter_chunks(words, chunksize)):
+            yield from chunk
+
+
+def _iter_chunks(words, size):
+    chunk = []
+    for word in words:
+        chunk.append(word)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_paradigm_rows(paradigms):
+    for word, tables in paradigms:
+        for rule, stem, forms in tables:
+            lemma = forms[0][1] if forms else None
+            for spec, form in forms:
+                yield OrderedDict([
+                    ('input', word),
+                    ('lemma', lemma),
+                    ('rule', rule),
+                    ('spec', spec),
+                    ('form', form),
+                ])
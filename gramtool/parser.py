@@ -9,6 +9,50 @@ from gramtool.validator import validate_spec
 from gramtool.exceptions import UserSideError
 
 
+def fill_specs(a, b):
+    alen = len(a)
+    blen = len(b)
+
+    if alen > blen:
+        return a, b + '-' * (alen - blen)
+    elif alen < blen:
+        return a + '-' * (blen - alen), b
+    else:
+        return a, b
+
+
+def match_spec(fltr, spec):
+    if fltr == '*' or spec == '*':
+        return True
+    if fltr.startswith('!'):
+        fltr = fltr[1:]
+        match = False
+    else:
+        match = True
+    fltr, spec = fill_specs(fltr, spec)
+    for i, f in enumerate(fltr):
+        if f == '*':
+            continue
+        if f != spec[i]:
+            return not match
+    return match
+
+
+def extend_spec(base, extension):
+    if extension == '*':
+        return base
+
+    if base == '*':
+        return extension
+
+    base, extension = fill_specs(base, extension)
+    newspec = ''.join([
+        b if extension[i] == '*' else extension[i]
+        for i, b in enumerate(base)
+    ])
+    return newspec
+
+
 class Parser(object):
     def __init__(self, tree, strict=True):
         self.tree = tree
@@ -20,6 +64,13 @@ class Parser(object):
         self.includes = defaultdict(list)
         self.max_include_level = 0
         self.strict = strict
+        self.expansions = {}
+        self.rule_refs = {}
+        # Specs and filters of a grammar are a small set of distinct strings,
+        # results are memoized for one parse, so that each pair is only
+        # compared once.
+        self.spec_matches = {}
+        self.spec_extensions = {}
 
     def strip_comments(self, line):
         if line.startswith('#'):
@@ -69,25 +120,26 @@ class Parser(object):
         if spec in rule.forms:
             raise GrammarSyntaxError(self, lineno, 'this form "%s" is already defined' % spec)
 
-        form = Form(rule, spec, level, stem)
-
+        form_prefixes = []
         for prefix in prefixes:
             prefix = '' if prefix == '.' else prefix
             if prefix.startswith('<'):
-                if len(form.prefixes) > 0:
-                    form.prefixes.append(prefix[1:])
+                if len(form_prefixes) > 0:
+                    form_prefixes.append(prefix[1:])
             elif prefix:
-                form.prefixes.append(prefix)
+                form_prefixes.append(prefix)
 
+        form_suffixes = []
         for suffix in reversed(suffixes):
             suffix = '' if suffix == '.' else suffix
             if suffix.endswith('>'):
                 suffix = suffix[:-1]
-                if len(form.suffixes) > 0:
-                    form.suffixes.insert(0, suffix)
+                if len(form_suffixes) > 0:
+                    form_suffixes.insert(0, suffix)
             elif suffix:
-                form.suffixes.insert(0, suffix)
-        rule.forms[spec] = form
+                form_suffixes.insert(0, suffix)
+
+        rule.forms[spec] = Form(rule, spec, level, stem, form_prefixes, form_suffixes)
 
     def parse_form(self, lineno, line):
         tokens = line.split()
@@ -133,45 +185,19 @@ class Parser(object):
         ))
 
     def fill_specs(self, a, b):
-        alen = len(a)
-        blen = len(b)
-
-        if alen > blen:
-            return a, b + '-' * (alen - blen)
-        elif alen < blen:
-            return a + '-' * (blen - alen), b
-        else:
-            return a, b
+        return fill_specs(a, b)
 
     def match_spec(self, fltr, spec):
-        if fltr == '*' or spec == '*':
-            return True
-        if fltr.startswith('!'):
-            fltr = fltr[1:]
-            match = False
-        else:
-            match = True
-        fltr, spec = self.fill_specs(fltr, spec)
-        for i, f in enumerate(fltr):
-            if f == '*':
-                continue
-            if f != spec[i]:
-                return not match
-        return match
+        key = (fltr, spec)
+        if key not in self.spec_matches:
+            self.spec_matches[key] = match_spec(fltr, spec)
+        return self.spec_matches[key]
 
     def extend_spec(self, lineno, base, extension):
-        if extension == '*':
-            return base
-
-        if base == '*':
-            return extension
-
-        base, extension = self.fill_specs(base, extension)
-        newspec = ''.join([
-            b if extension[i] == '*' else extension[i]
-            for i, b in enumerate(base)
-        ])
-        return newspec
+        key = (base, extension)
+        if key not in self.spec_extensions:
+            self.spec_extensions[key] = extend_spec(base, extension)
+        return self.spec_extensions[key]
 
     def get_include(self, lineno, key, rule, stack):
         if key not in self.rules:
@@ -184,12 +210,26 @@ class Parser(object):
 
         return include
 
-    def process_rule_includes(self, rule, slevel, node=None, sspec='*', sprefixes=None, ssuffixes=None, sfltr='*',
-                              nstack=None):
-        node = node or rule
-        sprefixes = sprefixes or tuple()
-        ssuffixes = ssuffixes or tuple()
-        nstack = nstack or tuple()
+    def refers_to_rule(self, node, stack=()):
+        """Check if node or any rule or macro it includes, includes top most rule (@)."""
+        if node.key not in self.rule_refs:
+            result = False
+            for includes in list(node.includes.values()):
+                for include in includes:
+                    key = include[2]
+                    if key == '@':
+                        result = True
+                    elif key != '.' and key in self.rules and self.rules[key].key not in stack:
+                        result = result or self.refers_to_rule(self.rules[key], stack + (node.key,))
+            self.rule_refs[node.key] = result
+        return self.rule_refs[node.key]
+
+    def expand_rule_includes(self, rule, slevel, node, sspec, sfltr, nstack):
+        """Return forms, that node includes add to rule.
+
+        Forms are (lineno, line, spec, prefixes, suffixes, stem) tuples, with
+        affixes relative to node.
+        """
         if isinstance(slevel, tuple):
             slevel = slevel[0]
             includes = node.includes['*']
@@ -198,10 +238,8 @@ class Parser(object):
         else:
             includes = []
         level = slevel + 1
+        result = []
         for lineno, line, key, spec, prefix, suffix, fltr in includes:
-            prefixes = (prefix,) + sprefixes
-            suffixes = ssuffixes + (suffix,)
-
             if key == '.':
                 include = node
             elif key == '@':
@@ -214,37 +252,62 @@ class Parser(object):
             for form in list(include.forms.values()):
                 if form.level < level and self.match_spec(nfltr, form.spec):
                     newspec = self.extend_spec(lineno, form.spec.lstrip('%'), nspec)
-                    prefs = tuple(form.prefixes) + prefixes
-                    suffs = suffixes + tuple(form.suffixes)
-                    self.add_form(
-                        lineno, line, rule, newspec, prefs, suffs, level,
-                        form.stem
-                    )
+                    result.append((
+                        lineno, line, newspec, form.prefixes + (prefix,), (suffix,) + form.suffixes,
+                        form.stem,
+                    ))
 
             if key not in ('.', '@'):
                 stack = nstack + (include.key,)
-                self.process_rule_includes(
-                    rule, slevel, include, nspec, prefixes, suffixes, nfltr,
-                    stack
-                )
-                self.process_rule_includes(
-                    rule, (slevel, '*'), include, nspec, prefixes, suffixes,
-                    nfltr, stack
-                )
-
-    def process_includes(self):
+                for variant in (slevel, (slevel, '*')):
+                    for _lineno, _line, _spec, prefixes, suffixes, stem in self.expand_include(
+                        rule, variant, include, nspec, nfltr, stack,
+                    ):
+                        result.append((_lineno, _line, _spec, prefixes + (prefix,), (suffix,) + suffixes, stem))
+        return result
+
+    def expand_include(self, rule, slevel, include, sspec, sfltr, nstack):
+        # Expansion of an include does not depend on the rule, that includes
+        # it, unless it includes the top most rule (@), so it is done once and
+        # shared by all rules. Cached forms of previous levels do not change.
+        if self.refers_to_rule(include):
+            return self.expand_rule_includes(rule, slevel, include, sspec, sfltr, nstack)
+        key = (include.key, slevel, sspec, sfltr)
+        if key not in self.expansions:
+            self.expansions[key] = self.expand_rule_includes(rule, slevel, include, sspec, sfltr, nstack)
+        return self.expansions[key]
+
+    def process_rule_includes(self, rule, slevel, node=None, sspec='*', sprefixes=None, ssuffixes=None, sfltr='*',
+                              nstack=None):
+        node = node or rule
+        sprefixes = sprefixes or tuple()
+        ssuffixes = ssuffixes or tuple()
+        nstack = nstack or tuple()
+        level = (slevel[0] if isinstance(slevel, tuple) else slevel) + 1
+        for lineno, line, spec, prefixes, suffixes, stem in self.expand_rule_includes(
+            rule, slevel, node, sspec, sfltr, nstack,
+        ):
+            self.add_form(lineno, line, rule, spec, prefixes + sprefixes, ssuffixes + suffixes, level, stem)
+
+    def process_includes(self, keys=None):
+        """Expand includes of all rules, or only of rules with given keys.
+
+        Rules, that are not expanded, must be already expanded.
+        """
         rules = OrderedDict()
         for key, rule in self.rules.items():
             if not rule.macro:
                 rules[key] = rule
+        expand = [rule for key, rule in rules.items() if keys is None or key in keys]
 
         for level in range(self.max_include_level + 1):
-            for key, rule in rules.items():
+            for rule in expand:
                 self.process_rule_includes(rule, level)
                 self.process_rule_includes(rule, (level, '*'))
         return rules
 
-    def parse(self, f, filename):
+    def parse_rules(self, f, filename):
+        """Parse and validate rules, without expanding includes."""
         self.filename = filename
         for lineno, line in enumerate(f, 1):
             line = line.strip()
@@ -263,6 +326,9 @@ class Parser(object):
                     self.parse_form(lineno, line)
 
         self.close_rule()
+
+    def parse(self, f, filename):
+        self.parse_rules(f, filename)
         return self.process_includes()
 
 
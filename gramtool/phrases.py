@@ -0,0 +1,173 @@
+import re
+
+from gramtool.cache import LRUCache
+from gramtool.grammar import change_spec
+from gramtool.symbols import get_symbol_table
+
+
+# Words (with inner dashes), whitespace and single punctuation characters,
+# so that joined tokens give back the same text.
+TOKEN = re.compile(r'\w+(?:-\w+)*|\s+|[^\w\s]')
+
+# Parts of speech, that agree with the noun they modify and properties they agree in.
+MODIFIERS = {'adjective', 'participle', 'pronoun'}
+AGREEMENT = ('gender', 'number', 'case')
+
+
+def tokenize(text):
+    return TOKEN.findall(text)
+
+
+def iter_tokens(chunks):
+    """Tokenize text chunks from an iterable, words split between chunks are joined.
+
+    Only the current chunk and the last tokens are kept in memory.
+    """
+    tail = ''
+    for chunk in chunks:
+        tokens = tokenize(tail + chunk)
+        # Last token can continue in the next chunk, so can a word followed by a dash.
+        n = 2 if len(tokens) > 1 and tokens[-1] == '-' and is_word(tokens[-2]) else 1
+        tail = ''.join(tokens[-n:])
+        del tokens[-n:]
+        yield from tokens
+    yield from tokenize(tail)
+
+
+def is_word(token):
+    return token[:1].isalpha()
+
+
+def get_spec_properties(symbols, spec):
+    """Return {property: value} of spec, unlike get_properties unspecified (-) properties are left out."""
+    table = get_symbol_table(symbols)
+    properties = table.properties.get(spec[:1])
+    if properties is None:
+        return None
+    return {prop: table.values[prop][code] for prop, code in zip(properties, spec) if code in table.values[prop]}
+
+
+class TextProcessor(object):
+    """Lemmatize running text and lemmatize or inflect noun phrases.
+
+    Analyses and inflection tables of words are cached, so that repeated
+    words are looked up once.
+
+        >>> text = TextProcessor(gramtool.gt)
+        >>> text.inflect_phrase('gražus namas', case='genitive')
+        'gražaus namo'
+    """
+
+    def __init__(self, gt, cache_size=100000):
+        self.gt = gt
+        self.analyses = LRUCache(cache_size)
+        self.tables = LRUCache(cache_size)
+
+    def get_analyses(self, word):
+        """Return [(lemma, spec, properties)] of word, most frequent lemma first."""
+        return self.analyses.get(word, self._get_analyses)
+
+    def _get_analyses(self, word):
+        result = []
+        for lemma, spec in self.gt.get_analyses(word):
+            properties = get_spec_properties(self.gt.symbols, spec)
+            if properties is not None:
+                result.append((lemma, spec, properties))
+        return result
+
+    def get_form_tables(self, word):
+        return self.tables.get(word, lambda word: list(self.gt.iter_form_tables(word)))
+
+    def change_form(self, word, spec, **kwargs):
+        """Change form of word, that has given spec, return None if it can not be changed."""
+        for table_spec, forms in self.get_form_tables(word):
+            if forms.get(spec.lower()) == word:
+                return forms.get(change_spec(self.gt.symbols, spec, **kwargs).lower())
+
+    def lemmatize(self, chunks):
+        """Yield tokens of text chunks, with each known word replaced by its lemma."""
+        for token in iter_tokens(chunks):
+            if is_word(token):
+                analyses = self.get_analyses(token)
+                if analyses:
+                    token = analyses[0][0]
+            yield token
+
+    def lemmatize_text(self, text):
+        return ''.join(self.lemmatize([text]))
+
+    def _find_head(self, words):
+        """Return (index, analyses) of phrase head, last noun or last known word."""
+        fallback = None
+        for i in reversed(range(len(words))):
+            analyses = self.get_analyses(words[i])
+            nouns = [analysis for analysis in analyses if analysis[2]['pos'] == 'noun']
+            if nouns:
+                return i, nouns
+            if analyses and fallback is None:
+                fallback = i, analyses
+        return fallback or (None, None)
+
+    def _find_agreement(self, word, head):
+        """Return analysis of word as a modifier agreeing with head analysis, or None."""
+        head_properties = head[2]
+        for analysis in self.get_analyses(word):
+            properties = analysis[2]
+            if properties['pos'] in MODIFIERS and all(
+                properties[prop] == head_properties[prop]
+                for prop in AGREEMENT if prop in properties and prop in head_properties
+            ):
+                return analysis
+
+    def _inflect(self, phrase, head_form, **kwargs):
+        tokens = tokenize(phrase)
+        words = [i for i, token in enumerate(tokens) if is_word(token)]
+        i, heads = self._find_head([tokens[j] for j in words])
+        if heads is None:
+            return None
+
+        # Ambiguous head form is read the way, most words before it agree with, most frequent first.
+        best = None
+        for head in heads:
+            modifiers = [(j, self._find_agreement(tokens[j], head)) for j in words[:i]]
+            modifiers = [(j, modifier) for j, modifier in modifiers if modifier is not None]
+            if best is None or len(modifiers) > len(best[1]):
+                best = head, modifiers
+        head, modifiers = best
+
+        head_index = words[i]
+        new_head = head_form(tokens[head_index], head)
+        if new_head is None:
+            return None
+        kwargs = kwargs or self._get_lemma_kwargs(new_head)
+        for j, modifier in modifiers:
+            tokens[j] = self.change_form(tokens[j], modifier[1], **kwargs) or tokens[j]
+        tokens[head_index] = new_head
+        return ''.join(tokens)
+
+    def _get_lemma_kwargs(self, lemma):
+        # Modifiers of a lemmatized phrase take case and number of the head lemma.
+        for analysis in self.get_analyses(lemma):
+            if analysis[2]['pos'] == 'noun':
+                return {prop: analysis[2][prop] for prop in ('number', 'case') if prop in analysis[2]}
+        return {'case': 'nominative'}
+
+    def lemmatize_phrase(self, phrase):
+        """Return lemma of a noun phrase, modifiers agree with the head noun lemma.
+
+        For example 'gražios knygos' -> 'graži knyga'. Words, that do not agree
+        with the head noun (genitive attributes and other words) are kept.
+        """
+        return self._inflect(phrase, lambda word, head: head[0])
+
+    def inflect_phrase(self, phrase, **kwargs):
+        """Change form of a noun phrase, like change_form does for a single word.
+
+        Head noun and modifiers agreeing with it are inflected, other words are kept.
+        """
+        return self._inflect(phrase, lambda word, head: self.change_form(word, head[1], **kwargs), **kwargs)
+
+    def inflect(self, phrases, **kwargs):
+        """Yield inflect_phrase results of phrases from an iterable."""
+        for phrase in phrases:
+            yield self.inflect_phrase(phrase, **kwargs)
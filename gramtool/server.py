@@ -0,0 +1,156 @@
+"""Long running gramtool server.
+
+Requests and responses are JSON. A request is an object like this:
+
+    {"method": "lemma", "word": "žodžiai"}
+    {"method": "change_form", "word": "žmogus", "case": "locative"}
+    {"method": "forms", "word": "namas"}
+
+or a list of such objects, to process many words in one round trip. Response
+is {"result": ...} or {"error": "..."}, or a list of those for a list of
+requests.
+
+Over a Unix socket each request and response is a single line. Over HTTP,
+requests are POSTed to /.
+"""
+
+import os
+import json
+import logging
+import socketserver
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from gramtool import GramTool
+from gramtool.paradigms import get_paradigms
+from gramtool.concurrent import ThreadLocalGramTool
+
+
+logger = logging.getLogger(__name__)
+
+
+class Dispatcher(object):
+    def __init__(self, gt):
+        # Each server thread gets its own hunspell handle and spell cache.
+        if isinstance(gt, GramTool):
+            gt = ThreadLocalGramTool(gt)
+        self.gt = gt
+        self.methods = {
+            'lemma': self.lemma,
+            'change_form': self.change_form,
+            'forms': self.forms,
+        }
+
+    def lemma(self, word):
+        return self.gt.get_lemma(word)
+
+    def change_form(self, word, **kwargs):
+        return self.gt.change_form(word, **kwargs)
+
+    def forms(self, word):
+        return [
+            {'rule': rule, 'stem': stem, 'forms': forms}
+            for rule, stem, forms in get_paradigms(self.gt.grammar, word)
+        ]
+
+    def handle(self, request):
+        if isinstance(request, list):
+            return [self.handle_one(r) for r in request]
+        else:
+            return self.handle_one(request)
+
+    def handle_one(self, request):
+        if not isinstance(request, dict):
+            return {'error': "Request must be a JSON object."}
+        request = dict(request)
+        name = request.pop('method', None)
+        if name not in self.methods:
+            return {'error': "Unknown method %r, available methods: %s." % (name, ', '.join(sorted(self.methods)))}
+        method = self.methods[name]
+        word = request.get('word')
+        if not isinstance(word, str) or not word.strip():
+            return {'error': "Request word must be a non-empty string."}
+
+        try:
+            return {'result': method(**request)}
+        except (TypeError, ValueError) as e:
+            return {'error': str(e)}
+        except Exception as e:
+            logger.exception("Request %r failed.", request)
+            return {'error': "Internal error: %s" % e}
+
+
+def handle_json(dispatcher, data):
+    try:
+        request = json.loads(data.decode('utf-8'))
+    except ValueError as e:
+        response = {'error': "Invalid JSON: %s" % e}
+    else:
+        response = dispatcher.handle(request)
+    return json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+
+class JSONLinesHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if line.strip():
+                self.wfile.write(handle_json(self.server.dispatcher, line) + b'\n')
+                self.wfile.flush()
+
+
+class HTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = handle_json(self.server.dispatcher, self.rfile.read(length))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def parse_address(address):
+    """Parse unix:/path/to/socket or [http://]host:port address."""
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if address.startswith('http://'):
+        address = address[len('http://'):]
+    host, port = address.rstrip('/').rsplit(':', 1)
+    return 'http', (host, int(port))
+
+
+def create_server(gt, address):
+    kind, address = parse_address(address)
+    if kind == 'unix':
+        if os.path.exists(address):
+            os.unlink(address)
+        server = UnixServer(address, JSONLinesHandler)
+    else:
+        server = HTTPServer(address, HTTPHandler)
+    server.dispatcher = Dispatcher(gt)
+    return server
+
+
+def serve(gt, address):
+    server = create_server(gt, address)
+    logger.info("Serving gramtool on %s", address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
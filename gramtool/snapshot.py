@@ -0,0 +1,214 @@
+import os
+import pickle
+import hashlib
+import logging
+import pathlib
+import tempfile
+
+from gramtool.parser import get_grammar_rules
+from gramtool.utils.grammar import get_grammar_tree
+from gramtool.utils.grammar import get_frequency_list
+from gramtool.utils.frequency import FrequencyTable
+from gramtool.utils.frequency import write_frequency_table
+from gramtool.grammar import Grammar
+from gramtool.constraints import build_dictionary_constraints
+from gramtool.spellfilter import SpellFilter
+from gramtool.spellfilter import build_spell_filter
+from gramtool.utils.bloom import BloomFilter
+
+
+logger = logging.getLogger(__name__)
+
+# Increase this, when Rule, Form or index structures change.
+SNAPSHOT_VERSION = 4
+# Glob pattern, that matches source hash part of cache file names.
+ANY_HASH = '?' * 16
+
+
+def get_cache_dir():
+    if 'GRAMTOOL_CACHE_DIR' in os.environ:
+        return pathlib.Path(os.environ['GRAMTOOL_CACHE_DIR'])
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return pathlib.Path(cache_home) / 'gramtool'
+
+
+def get_source_files(data_dir: pathlib.Path, language):
+    return [
+        data_dir / 'grammar.yaml',
+        data_dir / language / 'grammar',
+    ]
+
+
+def get_source_hash(files):
+    sha = hashlib.sha256()
+    sha.update(b'%d\n' % SNAPSHOT_VERSION)
+    for path in files:
+        with open(str(path), 'rb') as f:
+            content = f.read()
+        sha.update(b'%d\n' % len(content))
+        sha.update(content)
+    return sha.hexdigest()
+
+
+def get_snapshot_path(cache_dir: pathlib.Path, language, source_hash):
+    return cache_dir / ('%s-%s.pickle' % (language, source_hash[:16]))
+
+
+def build_snapshot(data_dir: pathlib.Path, language, source_hash):
+    symbols = get_grammar_tree(str(data_dir / 'grammar.yaml'))
+    rules = get_grammar_rules(symbols, str(data_dir / language / 'grammar'))
+    grammar = Grammar(None, symbols, rules)
+    return {
+        'version': SNAPSHOT_VERSION,
+        'hash': source_hash,
+        'symbols': symbols,
+        'rules': rules,
+        'indexes': (grammar.stems, grammar.suffixes, grammar.suffix_trie),
+    }
+
+
+def read_snapshot(path: pathlib.Path, source_hash):
+    try:
+        with open(str(path), 'rb') as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring broken grammar snapshot %s: %s", path, e)
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('hash') != source_hash:
+        logger.debug("Grammar snapshot %s is stale.", path)
+        return None
+
+    return snapshot
+
+
+def atomic_write(path: pathlib.Path, write, stale=None):
+    """Write file with write(f) and replace path with it.
+
+    If stale glob pattern is given, other files matching it in the same
+    directory, older versions of cache files built from different sources,
+    are removed after writing.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp, str(path))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    if stale:
+        remove_stale_files(path, stale)
+
+
+def remove_stale_files(path: pathlib.Path, pattern):
+    for stale in path.parent.glob(pattern):
+        if stale != path:
+            try:
+                stale.unlink()
+            except OSError as e:
+                logger.warning("Can't remove stale cache file %s: %s", stale, e)
+
+
+def write_snapshot(path: pathlib.Path, snapshot, language):
+    atomic_write(
+        path, lambda f: pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL),
+        get_snapshot_path(path.parent, language, ANY_HASH).name,
+    )
+
+
+def load_frequency_table(data_dir: pathlib.Path, language, cache_dir: pathlib.Path=None):
+    """Return memory mapped frequency table, rebuild it if frequency file has changed."""
+    cache_dir = cache_dir or get_cache_dir()
+    source = data_dir / language / 'frequency'
+    source_hash = get_source_hash([source])
+    path = cache_dir / ('%s-frequency-%s.idx' % (language, source_hash[:16]))
+
+    if not path.exists():
+        words = get_frequency_list(str(source))
+        atomic_write(path, lambda f: write_frequency_table(words, f), '%s-frequency-%s.idx' % (language, ANY_HASH))
+
+    return FrequencyTable(str(path))
+
+
+def load_spell_filter(data_dir: pathlib.Path, language, error_rate=0.01, cache_dir: pathlib.Path=None):
+    """Return spell filter, rebuild it if hunspell dictionary has changed.
+
+    Building expands the whole dictionary and takes minutes, use compile_grammar
+    to build it ahead of time.
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    aff = data_dir / language / 'hunspell.aff'
+    dic = data_dir / language / 'hunspell.dic'
+    source_hash = get_source_hash([aff, dic])
+    path = cache_dir / ('%s-spell-%s-%g.bloom' % (language, source_hash[:16], error_rate))
+
+    if not path.exists():
+        logger.info("Building spell filter %s, this can take a few minutes.", path)
+        bloom = build_spell_filter(str(aff), str(dic), error_rate)
+        atomic_write(path, bloom.write, '%s-spell-%s-%g.bloom' % (language, ANY_HASH, error_rate))
+
+    return SpellFilter(BloomFilter.load(str(path)))
+
+
+def load_stem_constraints(data_dir: pathlib.Path, language, rules, cache_dir: pathlib.Path=None):
+    """Return {rule key: StemConstraint}, rebuild them if grammar or hunspell dictionary has changed.
+
+    Building expands the whole dictionary and takes minutes, use compile_grammar
+    to build them ahead of time.
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    aff = data_dir / language / 'hunspell.aff'
+    dic = data_dir / language / 'hunspell.dic'
+    source_hash = get_source_hash(get_source_files(data_dir, language) + [aff, dic])
+    path = cache_dir / ('%s-stems-%s.pickle' % (language, source_hash[:16]))
+
+    try:
+        with open(str(path), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Ignoring broken stem constraints %s: %s", path, e)
+
+    logger.info("Building stem constraints %s, this can take a few minutes.", path)
+    constraints = build_dictionary_constraints(rules, str(aff), str(dic))
+    atomic_write(
+        path, lambda f: pickle.dump(constraints, f, protocol=pickle.HIGHEST_PROTOCOL),
+        '%s-stems-%s.pickle' % (language, ANY_HASH),
+    )
+    return constraints
+
+
+def compile_grammar(data_dir: pathlib.Path, language, cache_dir: pathlib.Path=None, spell_filter=None,
+                    stem_constraints=False):
+    """Save grammar snapshot, and spell filter, if its false positive rate is given, and stem constraints."""
+    cache_dir = cache_dir or get_cache_dir()
+    source_hash = get_source_hash(get_source_files(data_dir, language))
+    path = get_snapshot_path(cache_dir, language, source_hash)
+    snapshot = build_snapshot(data_dir, language, source_hash)
+    write_snapshot(path, snapshot, language)
+    if spell_filter:
+        load_spell_filter(data_dir, language, spell_filter, cache_dir)
+    if stem_constraints:
+        load_stem_constraints(data_dir, language, snapshot['rules'], cache_dir)
+    return path
+
+
+def load_snapshot(data_dir: pathlib.Path, language, cache_dir: pathlib.Path=None):
+    """Return fresh grammar snapshot, rebuild and save it if it is stale."""
+    cache_dir = cache_dir or get_cache_dir()
+    source_hash = get_source_hash(get_source_files(data_dir, language))
+    path = get_snapshot_path(cache_dir, language, source_hash)
+
+    snapshot = read_snapshot(path, source_hash)
+    if snapshot is None:
+        snapshot = build_snapshot(data_dir, language, source_hash)
+        try:
+            write_snapshot(path, snapshot, language)
+        except OSError as e:
+            logger.warning("Can't write grammar snapshot %s: %s", path, e)
+    return snapshot
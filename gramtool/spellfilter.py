@@ -0,0 +1,46 @@
+from gramtool.affixes import AffixDictionary
+from gramtool.utils.bloom import BloomFilter
+from gramtool.utils.bloom import get_bloom_size
+
+
+class SpellFilter(object):
+    """Bloom filter of all lower cased words of a hunspell dictionary.
+
+    Words, that are certainly not in the dictionary, are rejected without
+    calling hunspell. Words hunspell can accept without a dictionary entry
+    (numbers, words with dashes or dots) always pass.
+    """
+
+    def __init__(self, bloom):
+        self.bloom = bloom
+        self.checks = 0
+        self.rejects = 0
+
+    def __repr__(self):
+        return '<SpellFilter checks=%d rejects=%d>' % (self.checks, self.rejects)
+
+    def check(self, word):
+        """Return False if word is certainly misspelled."""
+        self.checks += 1
+        if not word.isalpha() or word.lower().encode('utf-8') in self.bloom:
+            return True
+        self.rejects += 1
+        return False
+
+    def info(self):
+        return {
+            'checks': self.checks,
+            'rejects': self.rejects,
+            'nbits': self.bloom.nbits,
+            'nhashes': self.bloom.nhashes,
+        }
+
+
+def build_spell_filter(aff, dic, error_rate=0.01):
+    """Expand all dictionary words with affix rules and add them to a Bloom filter."""
+    affixes = AffixDictionary(aff, dic)
+    n = sum(1 for word in affixes.iter_words())
+    bloom = BloomFilter(*get_bloom_size(n, error_rate))
+    for word in affixes.iter_words():
+        bloom.add(word.lower().encode('utf-8'))
+    return bloom
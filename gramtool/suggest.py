@@ -0,0 +1,160 @@
+import struct
+import pathlib
+
+from gramtool.lexicon import Lexicon
+from gramtool.lexicon import get_lexicon_hash
+from gramtool.snapshot import atomic_write
+from gramtool.paradigms import get_dictionary_words
+from gramtool.utils.grammar import get_frequency_list
+from gramtool.utils.frequency import get_frequency_ranks
+from gramtool.utils.mmaptable import MmapTable
+from gramtool.utils.mmaptable import write_table
+
+
+PARAMS = struct.Struct('<III')  # max distance, prefix length, number of words
+WORD = struct.Struct('<IH')  # frequency rank, length of word
+COUNT = struct.Struct('<I')  # number of words of a delete
+WORD_ID = struct.Struct('<I')
+NO_RANK = 0xFFFFFFFF
+
+
+def get_deletes(word, max_distance):
+    """Return all strings, that can be made from word by deleting up to max_distance letters."""
+    result = {word}
+    edits = {word}
+    for i in range(max_distance):
+        edits = {edit[:j] + edit[j + 1:] for edit in edits for j in range(len(edit))}
+        result |= edits
+    return result
+
+
+def get_distance(a, b, max_distance):
+    """Return optimal string alignment distance of a and b, or max_distance + 1 if it is larger."""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        prev, prev2, row = row, prev, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        if min(row) > max_distance:
+            return max_distance + 1
+    return min(row[-1], max_distance + 1)
+
+
+def build_suggest_index(words, max_distance=2, prefix_length=7):
+    """Build symmetric delete index of (word, frequency rank) pairs.
+
+    Each word is stored under all deletes of its first prefix_length lower
+    cased letters. A misspelled word is looked up by its own deletes, so
+    that a lookup costs the same, no matter how large the dictionary is.
+    Returns (words, deletes), deletes maps delete to word ids.
+    """
+    words = sorted(words, key=lambda item: (item[1], item[0]))
+    deletes = {}
+    for i, (word, rank) in enumerate(words):
+        for key in get_deletes(word.lower()[:prefix_length], max_distance):
+            deletes.setdefault(key, []).append(i)
+    return words, deletes
+
+
+def write_suggest_index(words, deletes, f, max_distance=2, prefix_length=7):
+    data = bytearray(PARAMS.pack(max_distance, prefix_length, len(words)))
+    offsets = []
+    for word, rank in words:
+        offsets.append(len(data))
+        encoded = word.encode('utf-8')
+        data += WORD.pack(rank, len(encoded)) + encoded
+    items = []
+    for key, ids in deletes.items():
+        items.append((key.encode('utf-8'), len(data)))
+        data += COUNT.pack(len(ids))
+        data += b''.join(WORD_ID.pack(offsets[i]) for i in ids)
+    write_table(SuggestIndex.magic, items, f, data)
+
+
+def compile_suggest_index(data_dir: pathlib.Path, language, path: pathlib.Path, lexicon: pathlib.Path=None,
+                          max_distance=2, prefix_length=7):
+    """Build suggest index of dictionary words and, if given, of all full form lexicon forms."""
+    ranks = get_frequency_ranks(get_frequency_list(str(data_dir / language / 'frequency')))
+    words = {word: ranks.get(word) for word in get_dictionary_words(data_dir, language)}
+    if lexicon:
+        table = Lexicon(str(lexicon), get_lexicon_hash(data_dir, language))
+        try:
+            for form, entries in table.items():
+                rank = min((ranks[entry.lemma] for entry in entries if entry.lemma in ranks), default=None)
+                if form not in words or words[form] is None:
+                    words[form] = rank
+        finally:
+            table.close()
+    words, deletes = build_suggest_index(
+        ((word, NO_RANK if rank is None else rank) for word, rank in words.items()), max_distance, prefix_length,
+    )
+    atomic_write(path, lambda f: write_suggest_index(words, deletes, f, max_distance, prefix_length))
+    return len(words)
+
+
+class SuggestIndex(MmapTable):
+    """Memory mapped symmetric delete index, written by compile_suggest_index.
+
+    Lookup cost is bounded: query is split into at most as many deletes as
+    there are for prefix_length letters and max_distance edits, and at most
+    max_candidates words are compared with the query.
+    """
+
+    magic = b'GTSUGG01'
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.max_distance, self.prefix_length, self.nwords = PARAMS.unpack_from(self.mm, self.data)
+
+    def _get_word(self, offset):
+        offset += self.data
+        rank, length = WORD.unpack_from(self.mm, offset)
+        offset += WORD.size
+        return self.mm[offset:offset + length].decode('utf-8'), rank
+
+    def _get_word_ids(self, key):
+        offset = self.lookup(key.encode('utf-8'))
+        if offset is None:
+            return ()
+        offset += self.data
+        count, = COUNT.unpack_from(self.mm, offset)
+        offset += COUNT.size
+        return struct.unpack_from('<%dI' % count, self.mm, offset)
+
+    def suggest(self, word, max_distance=None, limit=10, max_candidates=1000):
+        """Return up to limit dictionary words closest to word, most frequent first for the same distance.
+
+        Returns a list of (word, distance) pairs.
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        query = word.lower()
+        prefix = query[:self.prefix_length]
+
+        # Deletes with fewer edits are looked up first, their words are more likely to be close.
+        keys = sorted(get_deletes(prefix, max_distance), key=lambda key: (-len(key), key))
+        seen = set()
+        result = []
+        for key in keys:
+            for word_id in self._get_word_ids(key):
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                candidate, rank = self._get_word(word_id)
+                distance = get_distance(query, candidate.lower(), max_distance)
+                if distance <= max_distance:
+                    result.append((distance, rank, candidate))
+                if len(seen) >= max_candidates:
+                    break
+            if len(seen) >= max_candidates:
+                break
+        result.sort()
+        return [(candidate, distance) for distance, rank, candidate in result[:limit]]
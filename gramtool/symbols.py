@@ -0,0 +1,147 @@
+MAX_CACHE_SIZE = 2 ** 16
+
+
+def cache(results, key, value):
+    if len(results) >= MAX_CACHE_SIZE:
+        results.clear()
+    results[key] = value
+
+
+class SymbolTable(object):
+    """Grammar symbols from grammar.yaml, compiled for spec lookups.
+
+    Spec is a string of one letter codes, first is part of speech and the
+    rest are values of that part of speech properties, in the order given in
+    grammar section. Everything check_spec, change_spec and get_properties
+    need is looked up once here, instead of searching symbol lists on each
+    call.
+    """
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.pos = symbols['pos']
+
+        # Property name -> index in spec, for each part of speech code.
+        self.properties = {}
+        self.indexes = {}
+        for code, pos in self.pos.items():
+            properties = ('pos',) + tuple(symbols['grammar'].get(pos, []))
+            self.properties[code] = properties
+            self.indexes[code] = {prop: i for i, prop in reversed(list(enumerate(properties)))}
+
+        # Property name -> value name -> code, first code wins, like in grammar.yaml order.
+        self.codes = {}
+        # Property name -> value name -> codes, that match value (value and value-only).
+        self.matches = {}
+        # Property name -> code -> value name, without -only.
+        self.values = {}
+        for prop in {prop for properties in self.properties.values() for prop in properties}:
+            names = symbols[prop]
+            codes = self.codes[prop] = {}
+            matches = self.matches[prop] = {}
+            for code, name in names.items():
+                codes.setdefault(name, code)
+                matches.setdefault(name, set()).add(code)
+            for code, name in names.items():
+                if name.endswith('-only') and name[:-len('-only')] in matches:
+                    matches[name[:-len('-only')]].add(code)
+            self.values[prop] = {code: name.replace('-only', '') for code, name in names.items()}
+        self.values['pos'] = self.pos
+
+        # Property name -> (index in spec, value codes, matching codes), for each part of speech code.
+        self.lookups = {
+            code: {prop: (i, self.codes[prop], self.matches[prop]) for prop, i in indexes.items()}
+            for code, indexes in self.indexes.items()
+        }
+        # Results of valid lookups, there are few distinct specs and kwargs in practice.
+        self.properties_cache = {}
+        self.change_cache = {}
+
+    def __repr__(self):
+        return '<SymbolTable %d pos>' % len(self.pos)
+
+    def check_spec(self, spec, kwargs):
+        lookups = self.lookups[spec[0]]
+        for key, value in kwargs.items():
+            lookup = lookups.get(key)
+            if lookup is not None:
+                idx, codes, matches = lookup
+                if value not in matches:
+                    raise ValueError("Unknown symbol '%s' of '%s'." % (value, key))
+                code = spec[idx]
+                if code not in matches[value]:
+                    self.symbols[key][code]  # unknown code is an error, not a mismatch
+                    return False
+            elif key not in self.symbols:
+                raise ValueError("Unknown symbol '%s'." % key)
+        return True
+
+    def change_spec(self, spec, kwargs):
+        key = (spec, tuple(kwargs.items()))
+        result = self.change_cache.get(key)
+        if result is None:
+            result = self._change_spec(spec, kwargs)
+            cache(self.change_cache, key, result)
+        return result
+
+    def _change_spec(self, spec, kwargs):
+        lookups = self.lookups[spec[0]]
+        result = None
+        for key, value in kwargs.items():
+            lookup = lookups.get(key)
+            if lookup is not None:
+                idx, codes, matches = lookup
+                try:
+                    code = codes[value]
+                except KeyError:
+                    raise ValueError("Unknown symbol '%s' of '%s'." % (value, key))
+                if spec[idx] != code:
+                    if result is None:
+                        result = list(spec)
+                    result[idx] = code
+            elif key not in self.symbols:
+                raise ValueError("Unknown symbol '%s'." % key)
+        return spec if result is None else ''.join(result)
+
+    def get_properties(self, spec):
+        """Return (property, value) pairs of spec."""
+        try:
+            return self.properties_cache[spec]
+        except KeyError:
+            pass
+        if not spec:
+            raise ValueError("Unknown 'pos' symbol.")
+        try:
+            properties = self.properties[spec[0]]
+        except KeyError:
+            raise ValueError("Unknown symbol %r of 'pos'." % spec[0])
+        values = self.values
+        result = []
+        for prop, symbol in zip(properties, spec):
+            try:
+                result.append((prop, values[prop][symbol]))
+            except KeyError:
+                raise ValueError("Unknown symbol %r of %r." % (symbol, prop))
+        if len(spec) < len(properties):
+            raise ValueError("Unknown %r symbol." % properties[len(spec)])
+        result = tuple(result)
+        cache(self.properties_cache, spec, result)
+        return result
+
+
+_tables = {}
+
+
+def get_symbol_table(symbols):
+    """Return compiled symbol table of given grammar tree, compiled once per tree."""
+    entry = _tables.get(id(symbols))
+    if entry is not None and entry[0] is symbols:
+        return entry[1]
+    if isinstance(symbols, SymbolTable):
+        return symbols
+    # Tree is kept referenced, so that its id is not reused by another one.
+    if len(_tables) >= 16:
+        _tables.clear()
+    table = SymbolTable(symbols)
+    _tables[id(symbols)] = (symbols, table)
+    return table
@@ -0,0 +1,54 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_array(values):
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def get_unique(values):
+    """Return (distinct values in order of appearance, indexes of values in them)."""
+    indexes = {}
+    inverse = [indexes.setdefault(value, len(indexes)) for value in values]
+    return list(indexes), numpy.array(inverse, dtype=numpy.intp)
+
+
+def to_object_array(values):
+    # Items are set one by one, so that tuples are not unpacked into a second dimension.
+    array = numpy.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+def map_unique(func, values, n=None):
+    """Call func once for each distinct value and scatter results back.
+
+    Returns a list, or a NumPy object array of the same shape, if values is a
+    NumPy array. If func returns n-tuples, n aligned lists or arrays are
+    returned instead.
+    """
+    if is_array(values):
+        flat = values.ravel()
+        if flat.dtype == object:
+            # numpy.unique sorts values, which fails for None and mixed types.
+            uniques, inverse = get_unique(flat.tolist())
+        else:
+            uniques, inverse = numpy.unique(flat, return_inverse=True)
+            uniques = uniques.tolist()
+        results = [func(value) for value in uniques]
+        columns = [results] if n is None else list(zip(*results)) or [()] * n
+        arrays = [to_object_array(column)[inverse].reshape(values.shape) for column in columns]
+        return arrays[0] if n is None else tuple(arrays)
+
+    cache = {}
+    results = []
+    for value in values:
+        if value not in cache:
+            cache[value] = func(value)
+        results.append(cache[value])
+    if n is None:
+        return results
+    return tuple([result[i] for result in results] for i in range(n))
@@ -0,0 +1,58 @@
+import math
+import mmap
+import struct
+import hashlib
+
+
+HEADER = struct.Struct('<8sQI')  # magic, number of bits, number of hash functions
+MASK64 = (1 << 64) - 1
+
+
+def get_bloom_size(n, error_rate):
+    """Return (number of bits, number of hash functions) for n items and given false positive rate."""
+    nbits = max(8, int(math.ceil(-n * math.log(error_rate) / math.log(2) ** 2)))
+    nbits += -nbits % 8
+    nhashes = max(1, int(round(nbits / max(n, 1) * math.log(2))))
+    return nbits, nhashes
+
+
+def get_hashes(key, nbits, nhashes):
+    h = int.from_bytes(hashlib.blake2b(key, digest_size=16).digest(), 'little')
+    h1, h2 = h & MASK64, (h >> 64) | 1
+    return [(h1 + i * h2) % nbits for i in range(nhashes)]
+
+
+class BloomFilter(object):
+    """Bloom filter of bytes keys, can be saved and then memory mapped."""
+
+    magic = b'GTBLOOM1'
+
+    def __init__(self, nbits, nhashes, bits=None):
+        self.nbits = nbits
+        self.nhashes = nhashes
+        self.bits = bytearray(nbits // 8) if bits is None else bits
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, nbits, nhashes = HEADER.unpack_from(mm, 0)
+        if magic != cls.magic:
+            raise ValueError("%s is not a %s file." % (filename, cls.__name__))
+        return cls(nbits, nhashes, memoryview(mm)[HEADER.size:])
+
+    def write(self, f):
+        f.write(HEADER.pack(self.magic, self.nbits, self.nhashes))
+        f.write(self.bits)
+
+    def add(self, key):
+        bits = self.bits
+        for i in get_hashes(key, self.nbits, self.nhashes):
+            bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, key):
+        bits = self.bits
+        for i in get_hashes(key, self.nbits, self.nhashes):
+            if not bits[i >> 3] & (1 << (i & 7)):
+                return False
+        return True
@@ -0,0 +1,17 @@
+def get_dic_encoding(aff):
+    with open(aff, 'rb') as f:
+        for line in f:
+            if line.startswith(b'SET '):
+                return line.split()[1].decode('ascii')
+    return 'ISO8859-1'
+
+
+def get_dictionary_stems(aff, dic):
+    result = []
+    with open(dic, encoding=get_dic_encoding(aff)) as f:
+        next(f)  # first line is the number of entries
+        for line in f:
+            stem = line.split('/', 1)[0].strip()
+            if stem:
+                result.append(stem)
+    return result
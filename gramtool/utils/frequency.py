@@ -0,0 +1,28 @@
+from gramtool.utils.mmaptable import MmapTable
+from gramtool.utils.mmaptable import write_table
+
+
+def get_frequency_ranks(words):
+    """Map each word to the index of its first occurrence in words."""
+    ranks = {}
+    for rank, word in enumerate(words):
+        ranks.setdefault(word, rank)
+    return ranks
+
+
+def write_frequency_table(words, f):
+    ranks = get_frequency_ranks(words)
+    items = [(word.encode('utf-8'), rank) for word, rank in ranks.items()]
+    write_table(FrequencyTable.magic, items, f)
+
+
+class FrequencyTable(MmapTable):
+    """Memory mapped frequency ranks, written by write_frequency_table."""
+
+    magic = b'GTFREQ02'
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def get(self, word, default=None):
+        return self.lookup(word.encode('utf-8'), default)
@@ -0,0 +1,81 @@
+import mmap
+import zlib
+import struct
+
+
+HEADER = struct.Struct('<8sIII')  # magic, number of keys, number of slots, data offset
+SLOT = struct.Struct('<III')  # key offset, key length, value
+EMPTY = 0xFFFFFFFF
+
+
+def write_table(magic, items, f, data=b''):
+    """Write an open addressing hash table of bytes keys and uint32 values.
+
+    Extra data is appended to the end of the table, values usually are offsets
+    into it.
+    """
+    nslots = 1
+    while nslots < len(items) * 2:
+        nslots *= 2
+    mask = nslots - 1
+
+    slots = [(EMPTY, 0, 0)] * nslots
+    keys = bytearray()
+    for key, value in items:
+        h = zlib.crc32(key) & mask
+        while slots[h][0] != EMPTY:
+            h = (h + 1) & mask
+        slots[h] = (len(keys), len(key), value)
+        keys += key
+
+    data_offset = HEADER.size + nslots * SLOT.size + len(keys)
+    f.write(HEADER.pack(magic, len(items), nslots, data_offset))
+    for slot in slots:
+        f.write(SLOT.pack(*slot))
+    f.write(keys)
+    f.write(data)
+
+
+class MmapTable(object):
+    """Memory mapped hash table, written by write_table.
+
+    Pages are shared between all processes, that map the same file.
+    """
+
+    magic = None
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, nslots, self.data = HEADER.unpack_from(self.mm, 0)
+        if magic != self.magic:
+            raise ValueError("%s is not a %s file." % (filename, self.__class__.__name__))
+        self.mask = nslots - 1
+        self.slots = HEADER.size
+        self.keys = HEADER.size + nslots * SLOT.size
+
+    def __len__(self):
+        return self.size
+
+    def lookup(self, key, default=None):
+        h = zlib.crc32(key) & self.mask
+        while True:
+            offset, length, value = SLOT.unpack_from(self.mm, self.slots + h * SLOT.size)
+            if offset == EMPTY:
+                return default
+            if length == len(key):
+                offset += self.keys
+                if self.mm[offset:offset + length] == key:
+                    return value
+            h = (h + 1) & self.mask
+
+    def items(self):
+        """Yield all (key, value) pairs, in table order."""
+        for h in range(self.mask + 1):
+            offset, length, value = SLOT.unpack_from(self.mm, self.slots + h * SLOT.size)
+            if offset != EMPTY:
+                offset += self.keys
+                yield self.mm[offset:offset + length], value
+
+    def close(self):
+        self.mm.close()
@@ -2,8 +2,8 @@ def print_grammar(grammar):
     for key, rule in grammar.rules.items():
         print('@rule %s' % key)
         for form in rule.forms.values():
-            word = '-'.join(form.prefixes + ['(stem)'] + form.suffixes)
-            word = ''.join(form.prefixes + ['v'] + form.suffixes)
+            word = '-'.join(form.prefixes + ('(stem)',) + form.suffixes)
+            word = ''.join(form.prefixes + ('v',) + form.suffixes)
             print(' '.join([form.spec, word]))
         print()
 
@@ -15,8 +15,8 @@ def print_forms(grammar, word):
 
 def print_all_forms(grammar, word):
     for stem, suffix, rule in grammar.find_rules(word):
-        forms = rule.build_forms(stem)
-        if grammar.check_spelling(forms):
+        forms = list(rule.build_forms(stem))
+        if grammar.check_forms(rule, forms):
             print()
             print(rule.name)
             for form in rule.forms.values():
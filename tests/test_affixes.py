@@ -0,0 +1,58 @@
+import pytest
+
+from gramtool import gt
+from gramtool import GramTool
+from gramtool.affixes import AffixDictionary
+
+
+WORDS = [
+    'namas', 'namo', 'namuose', 'Namas', 'NAMAS', 'namai-medžiai', 'Vilniaus', 'vilniaus', 'VILNIAUS',
+    'žmoguje', 'nežmoguje', 'šunį', 'Abakai', 'abakai', 'AB', 'ab', 'xyzzy', 'namasx', '', '12', 'kairėje',
+    'medžius', 'pasiskaitė', 'nepasiskaitė', 'pasiskaityti', 'kxuo', 'nelabas', 'nelabe',
+]
+
+
+@pytest.fixture(scope='module')
+def affixes():
+    return AffixDictionary(str(gt.data_dir / 'lt' / 'hunspell.aff'), str(gt.data_dir / 'lt' / 'hunspell.dic'))
+
+
+def test_same_as_hunspell(affixes):
+    assert [affixes.spell(w) for w in WORDS] == [bool(gt.hunspell.spell(w)) for w in WORDS]
+
+
+def test_gramtool(affixes):
+    words = ['Vilniaus', 'žodžiai', 'namo', 'medžius', 'xyzzy']
+    tool = GramTool(spell_checker='affixes')
+    assert isinstance(tool.hunspell, AffixDictionary)
+    assert tool.copy().hunspell is tool.hunspell
+    assert [tool.get_lemma(w) for w in words] == [gt.get_lemma(w) for w in words]
+    assert tool.change_form('žmogus', case='locative') == gt.change_form('žmogus', case='locative')
+
+
+def test_cross_product(tmpdir):
+    aff = tmpdir.join('test.aff')
+    aff.write('\n'.join([
+        'SET UTF-8',
+        'PFX A Y 1',
+        'PFX A 0 ne .',
+        'PFX B N 1',
+        'PFX B 0 be .',
+        'SFX C Y 1',
+        'SFX C as ai as',
+        '',
+    ]))
+    dic = tmpdir.join('test.dic')
+    dic.write('2\nnamas/AC\nmedis/BC\n')
+    d = AffixDictionary(str(aff), str(dic))
+    assert [d.check_word(w) for w in ['namas', 'namai', 'nenamas', 'nenamai', 'nemedis']] == [True] * 4 + [False]
+    assert [d.check_word(w) for w in ['bemedis', 'medai', 'bemedai']] == [True, False, False]
+
+
+def test_unsupported(tmpdir):
+    aff = tmpdir.join('test.aff')
+    aff.write('SET UTF-8\nCOMPOUNDFLAG X\n')
+    dic = tmpdir.join('test.dic')
+    dic.write('1\nnamas/X\n')
+    with pytest.raises(ValueError):
+        AffixDictionary(str(aff), str(dic))
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+from gramtool import gt
+from gramtool.aio import AsyncGramTool
+
+
+WORDS = ['Vilniaus', 'žodžiai', 'namo', 'žmoguje', 'xyzzy', 'medžius', 'dėžėje']
+
+
+class Blocking(object):
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def get_lemma(self, word):
+        self.event.wait(5)
+        self.calls.append(word)
+        if word == 'error':
+            raise ValueError(word)
+        return word.upper()
+
+
+def test_async_gramtool():
+    async def run():
+        async with AsyncGramTool(gt, max_workers=2) as agt:
+            lemmas = await asyncio.gather(*[agt.get_lemma(w) for w in WORDS * 3])
+            forms = await asyncio.gather(*[agt.change_form(w, case='genitive') for w in WORDS])
+            return lemmas, forms, agt.computed
+
+    lemmas, forms, computed = asyncio.run(run())
+    assert lemmas == [gt.get_lemma(w) for w in WORDS * 3]
+    assert forms == [gt.change_form(w, case='genitive') for w in WORDS]
+    assert computed == len(WORDS) * 2
+
+
+def test_coalesce_and_batch():
+    fake = Blocking()
+
+    async def run():
+        async with AsyncGramTool(fake, max_workers=1, batch_size=4) as agt:
+            tasks = [asyncio.ensure_future(agt.get_lemma(w)) for w in 'abcdefgh' * 3]
+            await asyncio.sleep(0.05)
+            fake.event.set()
+            return await asyncio.gather(*tasks), agt.coalesced, agt.batches
+
+    results, coalesced, batches = asyncio.run(run())
+    assert results == list('ABCDEFGH' * 3)
+    assert sorted(fake.calls) == list('abcdefgh')
+    assert coalesced == 16
+    assert batches == 2
+
+
+def test_error():
+    fake = Blocking()
+    fake.event.set()
+
+    async def run():
+        async with AsyncGramTool(fake) as agt:
+            return await asyncio.gather(agt.get_lemma('error'), agt.get_lemma('ok'), return_exceptions=True)
+
+    error, ok = asyncio.run(run())
+    assert isinstance(error, ValueError)
+    assert ok == 'OK'
+
+
+def test_cancel():
+    fake = Blocking()
+
+    async def run():
+        async with AsyncGramTool(fake, max_workers=1, batch_size=1) as agt:
+            a = asyncio.ensure_future(agt.get_lemma('a'))
+            b1 = asyncio.ensure_future(agt.get_lemma('b'))
+            b2 = asyncio.ensure_future(agt.get_lemma('b'))
+            c = asyncio.ensure_future(agt.get_lemma('c'))
+            await asyncio.sleep(0.05)
+            # One of two callers waiting for 'b' gives up, 'b' is still computed.
+            b1.cancel()
+            c.cancel()
+            await asyncio.sleep(0.01)
+            fake.event.set()
+            return await a, await b2, b1.cancelled(), c.cancelled()
+
+    assert asyncio.run(run()) == ('A', 'B', True, True)
+    assert fake.calls == ['a', 'b']
+
+
+def test_backpressure():
+    fake = Blocking()
+
+    async def run():
+        async with AsyncGramTool(fake, max_workers=1, max_pending=2, batch_size=1) as agt:
+            tasks = [asyncio.ensure_future(agt.get_lemma(w)) for w in 'abcdefgh']
+            await asyncio.sleep(0.05)
+            full = agt.queue.full()
+            fake.event.set()
+            return full, await asyncio.gather(*tasks)
+
+    full, results = asyncio.run(run())
+    assert full
+    assert results == list('ABCDEFGH')
+
+
+def test_cancel_under_backpressure():
+    fake = Blocking()
+
+    async def run():
+        async with AsyncGramTool(fake, max_workers=1, max_pending=1, batch_size=1) as agt:
+            tasks = [asyncio.ensure_future(agt.get_lemma(w)) for w in 'abc']
+            await asyncio.sleep(0.05)
+            # Queue is full, first caller for 'd' waits to put it, second one is coalesced.
+            d1 = asyncio.ensure_future(agt.get_lemma('d'))
+            await asyncio.sleep(0.01)
+            d2 = asyncio.ensure_future(agt.get_lemma('d'))
+            await asyncio.sleep(0.01)
+            d1.cancel()
+            await asyncio.sleep(0.01)
+            fake.event.set()
+            return await asyncio.wait_for(asyncio.gather(*tasks, d2), 5), d1.cancelled()
+
+    assert asyncio.run(run()) == (['A', 'B', 'C', 'D'], True)
@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+
+from gramtool import gt
+from gramtool.utils.arrays import map_unique
+from gramtool.batch import iter_batch
+from gramtool.batch import write_tsv
+from gramtool.batch import write_jsonl
+
+
+def test_tsv():
+    output = StringIO()
+    write_tsv(iter_batch(gt, ['Vilniaus\n', '\n', 'Šiaulių banko\n', 'xyzzy\n']), output)
+    assert output.getvalue() == (
+        'Vilniaus\tVilnius\n'
+        'Šiaulių banko\tŠiaulių bankas\n'
+        'xyzzy\t\n'
+    )
+
+
+def test_jsonl_change_form():
+    output = StringIO()
+    write_jsonl(iter_batch(gt, ['žmogus', 'xyzzy'], case='locative'), output)
+    assert output.getvalue().splitlines() == [
+        '{"input": "žmogus", "lemma": "žmogus", "form": "žmoguje"}',
+        '{"input": "xyzzy", "lemma": null, "form": null}',
+    ]
+
+
+def test_map_unique():
+    calls = []
+
+    def func(word):
+        calls.append(word)
+        return word.upper(), len(word)
+
+    assert map_unique(func, ['a', 'bb', 'a', 'a']) == [('A', 1), ('BB', 2), ('A', 1), ('A', 1)]
+    assert calls == ['a', 'bb']
+    assert map_unique(func, ['a', 'bb', 'a'], n=2) == (['A', 'BB', 'A'], [1, 2, 1])
+    assert map_unique(func, [], n=2) == ([], [])
+
+
+def test_map_unique_numpy():
+    numpy = pytest.importorskip('numpy')
+    calls = []
+
+    def func(word):
+        calls.append(word)
+        return word.upper(), len(word)
+
+    upper, length = map_unique(func, numpy.array([['a', 'bb'], ['bb', 'bb']]), n=2)
+    assert sorted(calls) == ['a', 'bb']
+    assert upper.tolist() == [['A', 'BB'], ['BB', 'BB']]
+    assert length.tolist() == [[1, 2], [2, 2]]
+
+
+def test_analyze_many():
+    words = ['Vilniaus', 'žodžiai', 'xyzzy', 'Vilniaus', 'Šiaulių banko']
+    lemmas, specs = gt.analyze_many(words)
+    assert lemmas == ['Vilnius', 'žodis', None, 'Vilnius', 'Šiaulių bankas']
+    assert lemmas == gt.get_lemmas(words)
+    assert specs[:3] == [gt.analyze('Vilniaus')[1], 'nmpn', None]
+    assert gt.change_forms(['žmogus', 'xyzzy', 'žmogus'], case='locative') == ['žmoguje', None, 'žmoguje']
+
+
+def test_analyze_empty_phrases():
+    assert gt.analyze('') == (None, None)
+    assert gt.analyze('  ') == (None, None)
+    assert gt.analyze(None) == (None, None)
+    assert gt.get_lemmas(['Vilniaus', '', ' ']) == ['Vilnius', None, None]
+
+
+def test_map_unique_numpy_objects():
+    numpy = pytest.importorskip('numpy')
+    words = numpy.array(['Vilniaus', None, '', 'Vilniaus'], dtype=object)
+    lemmas, specs = gt.analyze_many(words)
+    assert lemmas.tolist() == ['Vilnius', None, None, 'Vilnius']
+    assert specs.tolist()[1:3] == [None, None]
+
+    # Tuple results are kept as tuples, when n is not given.
+    results = map_unique(lambda word: (word, 1), numpy.array(['a', 'b', 'a']))
+    assert results.shape == (3,)
+    assert results.tolist() == [('a', 1), ('b', 1), ('a', 1)]
@@ -0,0 +1,30 @@
+from gramtool.cache import LRUCache
+
+
+def test_lru_cache():
+    calls = []
+
+    def spell(word):
+        calls.append(word)
+        return word.endswith('as')
+
+    cache = LRUCache(maxsize=2)
+    assert cache.get('namas', spell) is True
+    assert cache.get('namax', spell) is False
+    assert cache.get('namax', spell) is False
+    assert calls == ['namas', 'namax']
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # namas is least recently used, so it gets evicted
+    cache.get('kelias', spell)
+    assert list(cache.data) == ['namax', 'kelias']
+    cache.get('namas', spell)
+    assert calls == ['namas', 'namax', 'kelias', 'namas']
+    assert cache.info() == {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2}
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0)
+    cache.get('namas', len)
+    cache.get('namas', len)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 0)
@@ -0,0 +1,70 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from gramtool import gt
+from gramtool.cache import LRUCache
+from gramtool.concurrent import ThreadLocalGramTool
+
+
+WORDS = ['Vilniaus', 'žodžiai', 'namo', 'žmoguje', 'xyzzy', 'Šiaulių banko', 'medžius', 'dėžėje'] * 10
+
+
+def test_copy_shares_grammar():
+    copy = gt.copy()
+    assert copy.grammar.rules is gt.grammar.rules
+    assert copy.grammar.suffix_trie is gt.grammar.suffix_trie
+    assert copy.frequency is gt.frequency
+    assert copy.hunspell is not gt.hunspell
+    assert copy.spell_cache is not gt.spell_cache
+    assert copy.grammar.spell_cache is copy.spell_cache
+    assert copy.get_lemma('žodžiai') == 'žodis'
+
+
+def test_lru_cache_contention():
+    cache = LRUCache(maxsize=10)
+    barrier = threading.Barrier(8)
+
+    def run(i):
+        barrier.wait()
+        return [cache.get(j % 30, lambda key: key * 2) for j in range(i, i + 2000)]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run, range(8)))
+    assert results == [[(j % 30) * 2 for j in range(i, i + 2000)] for i in range(8)]
+    assert cache.hits + cache.misses == 8 * 2000
+    assert len(cache) == 10
+
+
+def stress(tl):
+    expected = [(gt.get_lemma(w), gt.change_form(w, case='genitive')) for w in WORDS]
+    barrier = threading.Barrier(4)
+
+    def run(i):
+        barrier.wait()
+        words = WORDS[i:] + WORDS[:i]
+        return [(tl.get_lemma(w), tl.change_form(w, case='genitive')) for w in words]
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(run, range(4)))
+    assert results == [expected[i:] + expected[:i] for i in range(4)]
+
+
+def test_thread_local_gramtool():
+    stress(ThreadLocalGramTool(gt))
+
+
+def test_thread_local_gramtool_shared_cache():
+    stress(ThreadLocalGramTool(gt.copy(LRUCache(maxsize=50)), share_spell_cache=True))
+
+
+def test_reuse_finished_thread_copy():
+    tl = ThreadLocalGramTool(gt)
+    copies = []
+    for i in range(3):
+        thread = threading.Thread(target=lambda: copies.append(tl.get()))
+        thread.start()
+        thread.join()
+        del thread
+    assert copies[0] is copies[1] is copies[2]
+    assert tl.free == [copies[0]]
@@ -0,0 +1,98 @@
+import pathlib
+
+from gramtool import gt
+from gramtool.grammar import Form
+from gramtool.grammar import Rule
+from gramtool.grammar import Grammar
+from gramtool.snapshot import load_stem_constraints
+from gramtool.constraints import MAX_STEMS
+from gramtool.constraints import StemConstraint
+from gramtool.constraints import build_stem_constraints
+
+
+def get_test_rules():
+    noun = Rule(1, 'noun', 'noun')
+    noun.forms['nmsn'] = Form(noun, 'nmsn', 0, suffixes=['as'])
+    noun.forms['nmpn'] = Form(noun, 'nmpn', 0, suffixes=['ai'])
+    irregular = Rule(2, 'eiti', 'eiti')
+    irregular.forms['V'] = Form(irregular, 'V', 0, suffixes=['eiti'])
+    irregular.forms['vis3s--'] = Form(irregular, 'vis3s--', 0, suffixes=['ėjo'])
+    return {'noun': noun, 'eiti': irregular}
+
+
+def test_stem_constraint():
+    constraint = StemConstraint()
+    assert constraint.check('nam') is False
+    for stem in ['nam', 'med', 'Kel']:
+        constraint.add(stem.lower())
+    assert constraint.min_length == 3
+    assert constraint.check('nam') is True
+    assert constraint.check('Nam') is True
+    assert constraint.check('na') is False
+    assert constraint.check('pam') is False
+    assert constraint.check('na-m') is True
+
+    # Too many stems for a whitelist, only final letters are checked.
+    for i in range(MAX_STEMS):
+        constraint.add('x' * i + 'am')
+    assert constraint.stems is None
+    assert constraint.check('pam') is True
+    assert constraint.check('pak') is False
+
+
+def test_build_stem_constraints():
+    constraints = build_stem_constraints(get_test_rules(), ['namas', 'NAMAI', 'medis', 'eiti', 'pareiti', 'as'])
+    assert constraints['noun'].stems == {'nam', ''}
+    assert constraints['eiti'].stems == {'', 'par'}
+    assert constraints['eiti'].min_length == 0
+
+
+def test_find_rules_constraints():
+    rules = get_test_rules()
+    grammar = Grammar(None, None, rules)
+    assert [(stem, rule.key) for stem, suffix, rule in grammar.find_rules('ėjo')] == [('', 'eiti')]
+
+    grammar.constraints = build_stem_constraints(rules, ['namas', 'eiti'])
+    assert [(stem, rule.key) for stem, suffix, rule in grammar.find_rules('Namai')] == [('Nam', 'noun')]
+    assert list(grammar.find_rules('medai')) == []
+    assert [(stem, rule.key) for stem, suffix, rule in grammar.find_rules('ėjo')] == [('', 'eiti')]
+    assert list(grammar.find_rules('parėjo')) == []
+
+
+def test_find_rules_empty_suffix():
+    rule = Rule(1, 'adverb', 'adverb')
+    rule.forms['a'] = Form(rule, 'a', 0, suffixes=[''])
+    rules = get_test_rules()
+    rules['adverb'] = rule
+    grammar = Grammar(None, None, rules)
+    # Stem of empty suffix is the whole word, not the stem of the previous suffix.
+    assert [(stem, suffix) for stem, suffix, rule in grammar.find_rules('namas')] == [('nam', 'as'), ('namas', '')]
+    assert [(stem, suffix) for stem, suffix, rule in grammar.find_rules('medis')] == [('medis', '')]
+
+
+def test_load_stem_constraints(tmpdir):
+    tmpdir.join('lt').ensure(dir=True)
+    tmpdir.join('grammar.yaml').write('')
+    tmpdir.join('lt', 'grammar').write('')
+    tmpdir.join('lt', 'hunspell.aff').write('SET UTF-8\nSFX C Y 1\nSFX C as ai as\n')
+    tmpdir.join('lt', 'hunspell.dic').write('2\nnamas/C\nmedis\n')
+    data_dir = pathlib.Path(str(tmpdir))
+    cache_dir = pathlib.Path(str(tmpdir.join('cache')))
+
+    constraints = load_stem_constraints(data_dir, 'lt', get_test_rules(), cache_dir)
+    assert len(tmpdir.join('cache').listdir()) == 1
+    assert constraints['noun'].stems == {'nam'}
+    assert constraints['eiti'].min_length is None
+
+    # Second load reads saved constraints.
+    assert load_stem_constraints(data_dir, 'lt', {}, cache_dir)['noun'].stems == {'nam'}
+
+    # Constraints of changed dictionary replace stale ones.
+    tmpdir.join('lt', 'hunspell.dic').write('2\nnamas/C\nkelias\n')
+    assert load_stem_constraints(data_dir, 'lt', get_test_rules(), cache_dir)['noun'].stems == {'nam', 'keli'}
+    assert len(tmpdir.join('cache').listdir()) == 1
+
+
+def test_bound_grammar_constraints():
+    grammar = Grammar(None, gt.symbols, gt.grammar.rules, constraints={})
+    assert grammar.bind(None).constraints is grammar.constraints
@@ -1,3 +1,8 @@
+import sys
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
 import gramtool
 
 
@@ -26,3 +31,26 @@ def test_change_form():
     gramtool.change_form('šuo', case='accusative') == 'šunį'
     gramtool.change_form('pelėse', case='accusative') == 'peles'
     gramtool.change_form('krūmai', case='locative') == 'krūmuose'
+
+
+def test_lazy_import():
+    code = 'import sys, gramtool; print(gramtool._gt is None, "hunspell" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.split() == [b'True', b'False']
+
+
+def test_preload():
+    with ThreadPoolExecutor(4) as executor:
+        instances = list(executor.map(lambda i: gramtool.preload(), range(8)))
+    assert all(gt is gramtool.gt for gt in instances)
+
+
+def test_prefork():
+    code = (
+        'import gc, multiprocessing, gramtool\n'
+        'gt = gramtool.prefork()\n'
+        'with multiprocessing.get_context("fork").Pool(2) as pool:\n'
+        '    print(*pool.map(gramtool.get_lemma, ["Vilniaus", "žodžiai"]), gc.get_freeze_count() > 0, gc.isenabled())\n'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.decode().split() == ['Vilnius', 'žodis', 'True', 'True']
@@ -0,0 +1,39 @@
+import random
+
+from gramtool.utils.frequency import FrequencyTable
+from gramtool.utils.frequency import get_frequency_ranks
+from gramtool.utils.frequency import write_frequency_table
+
+
+WORDS = ['Vilnius', 'namas', 'žmogus', 'namas', 'medis', '', 'žodis']
+
+
+def test_frequency_ranks():
+    ranks = get_frequency_ranks(WORDS)
+    for word in WORDS:
+        assert ranks[word] == WORDS.index(word)
+    assert ranks.get('kelias') is None
+
+
+def test_frequency_table(tmpdir):
+    words = WORDS + ['žodis%d' % i for i in range(1000)]
+    random.Random(0).shuffle(words)
+    path = str(tmpdir.join('frequency.idx'))
+    with open(path, 'wb') as f:
+        write_frequency_table(words, f)
+
+    table = FrequencyTable(path)
+    assert len(table) == len(set(words))
+    for word in words:
+        assert table.get(word) == words.index(word)
+    assert table.get('kelias', float('inf')) == float('inf')
+    assert 'namas' in table
+    assert 'kelias' not in table
+    table.close()
+
+
+def test_empty_frequency_table(tmpdir):
+    path = str(tmpdir.join('frequency.idx'))
+    with open(path, 'wb') as f:
+        write_frequency_table([], f)
+    assert FrequencyTable(path).get('namas') is None
@@ -1,9 +1,14 @@
 import pytest
 
 from gramtool import gt
+from gramtool.grammar import Form
+from gramtool.grammar import Rule
+from gramtool.grammar import Grammar
 from gramtool.grammar import check_spec
 from gramtool.grammar import change_spec
 from gramtool.grammar import get_properties
+from gramtool.grammar import SuffixTrie
+from gramtool.symbols import get_symbol_table
 
 
 def test_check_spec():
@@ -34,7 +39,13 @@ def test_value_error():
 
 
 def test_change_spec():
-    change_spec(gt.symbols, 'nmsn', case='genitive') == 'nmsg'
+    assert change_spec(gt.symbols, 'nmsn', case='genitive') == 'nmsg'
+    assert change_spec(gt.symbols, 'nmsn', case='genitive', number='plural') == 'nmpg'
+    assert change_spec(gt.symbols, 'nmsn', case='nominative') == 'nmsn'
+    with pytest.raises(ValueError):
+        change_spec(gt.symbols, 'nmsn', case='incorrect')
+    with pytest.raises(ValueError):
+        change_spec(gt.symbols, 'nmsn', incorrect='genitive')
 
 
 def test_get_properties():
@@ -58,3 +69,87 @@ def test_get_properties_error():
 
     with pytest.raises(ValueError):
         get_properties(gt.symbols, 'n?sg')
+
+
+def test_suffix_trie():
+    trie = SuffixTrie([('ias', 1), ('as', 2), ('s', 3), ('', 4), ('is', 5)])
+    assert trie.match('namas') == [('as', 2), ('s', 3), ('', 4)]
+    assert trie.match('kelias') == [('ias', 1), ('as', 2), ('s', 3), ('', 4)]
+    assert trie.match('namo') == [('', 4)]
+    assert SuffixTrie().match('namas') == []
+
+
+def test_find_rules_order():
+    for word in ['Vilniaus', 'žodžiai', 'namas', 'dirbome']:
+        suffixes = [suffix for stem, suffix, rule in gt.grammar.find_rules(word)]
+        assert suffixes == sorted(suffixes, key=len, reverse=True)
+        assert all(word.endswith(suffix) for suffix in suffixes)
+
+
+def test_pos_without_properties():
+    assert check_spec(gt.symbols, 'V', pos='infinitive') is True
+    assert check_spec(gt.symbols, 'V', case='genitive') is True
+    assert change_spec(gt.symbols, 'V', case='genitive') == 'V'
+    assert list(get_properties(gt.symbols, 'V').items()) == [('pos', 'infinitive')]
+
+
+def test_symbol_table():
+    table = get_symbol_table(gt.symbols)
+    assert get_symbol_table(gt.symbols) is table
+    assert get_symbol_table(table) is table
+    assert get_symbol_table(dict(gt.symbols)) is not table
+    assert check_spec(table, 'nMsg', gender='masculine') is True
+
+    # Cached properties are not shared between calls.
+    properties = get_properties(gt.symbols, 'nmsg')
+    properties['case'] = 'dative'
+    assert get_properties(gt.symbols, 'nmsg')['case'] == 'genitive'
+
+
+class RejectingSpeller(object):
+    def __init__(self, rejected):
+        self.rejected = rejected
+        self.calls = []
+
+    def spell(self, word):
+        self.calls.append(word)
+        return word not in self.rejected
+
+
+def test_check_forms_order():
+    g = gt.grammar
+    stem, suffix, rule = next(
+        (stem, suffix, rule) for stem, suffix, rule in g.find_rules('namas')
+        if 'namas' in rule.build_forms(stem) and len(rule.forms) > 2
+    )
+    forms = list(rule.build_forms(stem))
+    speller = RejectingSpeller({forms[-1]})
+    grammar = Grammar(speller, g.tree, g.rules, indexes=(g.stems, g.suffixes, g.suffix_trie))
+    assert grammar.bind(speller).form_order is grammar.form_order
+
+    # Form, that rejected, is moved up one place each time, until it is checked first.
+    for i in range(len(forms)):
+        speller.calls = []
+        assert grammar.check_forms(rule, forms) is False
+        assert speller.calls[-1] == forms[-1]
+        assert len(speller.calls) == max(len(forms) - i, 1)
+    assert grammar.form_order[rule.key][1][0] == len(forms) - 1
+
+    speller.rejected = set()
+    assert grammar.check_forms(rule, forms) is True
+    assert sorted(speller.calls[-len(forms):]) == sorted(forms)
+
+
+def test_iter_rules_word_not_in_forms():
+    rule = Rule(1, 'ne', 'ne')
+    rule.forms['nmsn'] = Form(rule, 'nmsn', 0, suffixes=['as'])
+    rule.forms['nmsg'] = Form(rule, 'nmsg', 0, prefixes=['ne'], suffixes=['o'])
+    speller = RejectingSpeller(set())
+    grammar = Grammar(speller, None, {'ne': rule})
+
+    # Suffix matches, but rule does not produce the word, so no forms are spell checked.
+    assert list(grammar.iter_rules('namo')) == []
+    assert speller.calls == []
+
+    assert [(str(lemma), str(word)) for lemma, word in grammar.iter_rules('namas')] == [('namas', 'namas')]
+    assert sorted(speller.calls) == ['namas', 'nenamo']
@@ -2,6 +2,8 @@ import unittest
 
 from io import StringIO
 
+import pytest
+
 from gramtool.parser import Parser
 from gramtool.grammar import Grammar
 
@@ -17,7 +19,7 @@ def get_all_forms(grammar, stem='(stem)'):
         for form in rule.forms.values():
             if form.spec.startswith('%'):
                 continue
-            word = '-'.join(form.prefixes + [form.stem or stem] + form.suffixes)
+            word = '-'.join(form.prefixes + (form.stem or stem,) + form.suffixes)
             word = word.replace('+-', ' ').replace('-+', ' ').replace('+', ' ')
             lines.append(' '.join([form.spec, word]))
         lines.append('')
@@ -364,3 +366,60 @@ class MyTest(unittest.TestCase):
         xp3pp- have gone
 
         ''', 'learn'))
+
+
+def test_compact_forms():
+    tree = {'pos': {'x': 'fake'}, 'grammar': {'fake': ['a']}}
+    rules = Parser(tree, strict=False).parse(StringIO(strip('''
+    @rule a
+    xa ne+ as
+    xb . is
+
+    @rule b
+    xa ne+ as
+
+    @rule c
+    + a * . z>
+    ''')), 'rules.gram')
+    a, b = rules['a'].forms['xa'], rules['b'].forms['xa']
+    assert (a.prefix, a.suffix) == ('ne+', 'as')
+    assert a.get_word('nam') == 'ne+namas'
+    assert a.spec is b.spec and a.prefix is b.prefix and a.suffix is b.suffix
+    assert not hasattr(a, '__dict__')
+    with pytest.raises(AttributeError):
+        a.spec = 'xb'
+
+    c = rules['c'].forms['xb']
+    assert c.suffixes == ('z', 'is')
+    assert c.get_word('nam') == 'namzis'
+
+
+def test_shared_include_expansions():
+    tree = {'pos': {'x': 'fake'}, 'grammar': {'fake': ['a', 'b']}}
+    parser = Parser(tree, strict=False)
+    rules = parser.parse(StringIO(strip('''
+    @macro cases
+    x-a . as
+    x-b . ui
+
+    @macro neg
+    +1 @ xn* ne .
+
+    @rule a
+    + cases * . z>
+
+    @rule b
+    + cases * . y>
+    +1 neg
+    ''')), 'rules.gram')
+    assert {spec: form.get_word('nam') for spec, form in rules['a'].forms.items()} == {
+        'x-a': 'namzas', 'x-b': 'namzui',
+    }
+    assert {spec: form.get_word('nam') for spec, form in rules['b'].forms.items()} == {
+        'x-a': 'namyas', 'x-b': 'namyui', 'xna': 'nenamyas', 'xnb': 'nenamyui',
+    }
+    # Expansions of cases macro (own level and * level) are shared by both rules, neg includes the rule
+    # itself and is not cached.
+    keys = [key[0] for key in parser.expansions]
+    assert keys.count(parser.rules['cases'].key) == 2
+    assert parser.rules['neg'].key not in keys
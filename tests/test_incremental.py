@@ -0,0 +1,96 @@
+import io
+import pathlib
+
+import pytest
+import pkg_resources as pres
+
+from gramtool.parser import Parser
+from gramtool.incremental import RuleCompiler
+from gramtool.validator import GrammarSyntaxError
+from gramtool.utils.grammar import get_grammar_tree
+
+
+TREE = {
+    'pos': {'x': 'fake'},
+    'grammar': {'fake': ['a', 'b', 'c', 'd', 'e']}
+}
+
+GRAMMAR = """
+@macro m
+xa . as
+
+@rule a
+xb . is
++ m
+
+@rule b
++ a x*c . z>
+x-c . os
+
+@rule c
+xd . us
+"""
+
+
+def get_forms(rules):
+    return {
+        key: [(form.spec, form.get_word('(stem)'), form.level) for form in rule.forms.values()]
+        for key, rule in rules.items()
+    }
+
+
+def parse(source):
+    return Parser(TREE, strict=False).parse(io.StringIO(source), 'rules.gram')
+
+
+def compile(compiler, source):
+    return compiler.compile(io.StringIO(source))
+
+
+def test_recompile():
+    compiler = RuleCompiler(TREE, 'rules.gram', strict=False)
+    rules = compile(compiler, GRAMMAR)
+    assert get_forms(rules) == get_forms(parse(GRAMMAR))
+    assert compiler.expanded == {'a', 'b', 'c'}
+
+    previous = rules
+    rules = compile(compiler, '# comment\n' + GRAMMAR)
+    assert compiler.expanded == set()
+    assert all(rules[key] is previous[key] for key in rules)
+    assert rules['b'].lineno == previous['b'].lineno == 10
+
+    source = GRAMMAR
+    for old, new, expanded in [
+        ('xa . as', 'xa . es', {'a', 'b'}),
+        ('xb . is', 'xb . ys', {'a', 'b'}),
+        ('x-c . os', 'x-c . ai', {'b'}),
+        ('xd . us', 'xd . ui', {'c'}),
+    ]:
+        source = source.replace(old, new)
+        rules = compile(compiler, source)
+        assert compiler.expanded == expanded
+        assert list(rules) == ['a', 'b', 'c']
+        assert get_forms(rules) == get_forms(parse(source))
+
+
+def test_removed_include():
+    compiler = RuleCompiler(TREE, 'rules.gram', strict=False)
+    compile(compiler, GRAMMAR)
+    with pytest.raises(GrammarSyntaxError):
+        compile(compiler, GRAMMAR.replace('@macro m\nxa . as\n', ''))
+    # After a failed compilation, changes are compared with the last good one.
+    compile(compiler, GRAMMAR.replace('xd . us', 'xd . ui'))
+    assert compiler.expanded == {'c'}
+
+
+def test_lt_grammar():
+    data_dir = pathlib.Path(pres.resource_filename('gramtool', 'data'))
+    tree = get_grammar_tree(str(data_dir / 'grammar.yaml'))
+    filename = str(data_dir / 'lt' / 'grammar')
+    compiler = RuleCompiler(tree, filename)
+    rules = compiler.compile()
+    with open(filename) as f:
+        source = f.read()
+    assert get_forms(rules) == get_forms(Parser(tree).parse(io.StringIO(source), filename))
+    compiler.compile()
+    assert compiler.expanded == set()
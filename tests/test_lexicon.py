@@ -0,0 +1,124 @@
+import shutil
+import pathlib
+
+import pytest
+import pkg_resources as pres
+
+import gramtool
+
+from gramtool.lexicon import Lexicon
+from gramtool.lexicon import LexiconEntry
+from gramtool.lexicon import build_lexicon
+from gramtool.lexicon import write_lexicon
+from gramtool.lexicon import compile_lexicon
+from gramtool.lexicon import get_lexicon_hash
+from gramtool.folding import fold
+from gramtool.folding import FoldedIndex
+from gramtool.folding import build_folded_index
+from gramtool.folding import compile_folded_index
+
+
+WORDS = ['Vilnius', 'dėžė', 'medis', 'namas', 'žmogus', 'žodis']
+
+
+def make_data_dir(tmpdir):
+    # Same grammar, but hunspell dictionary with only a few words.
+    data_dir = pathlib.Path(pres.resource_filename('gramtool', 'data'))
+    tmpdir = pathlib.Path(str(tmpdir)) / 'data'
+    (tmpdir / 'lt').mkdir(parents=True)
+    for name in ['grammar.yaml', 'lt/grammar', 'lt/hunspell.aff', 'lt/frequency']:
+        shutil.copy(str(data_dir / name), str(tmpdir / name))
+    with (data_dir / 'lt' / 'hunspell.dic').open(encoding='iso8859-13') as f:
+        lines = [line for line in f if line.split('/')[0].strip() in WORDS]
+    with (tmpdir / 'lt' / 'hunspell.dic').open('w', encoding='iso8859-13') as f:
+        f.write('%d\n' % len(lines))
+        f.writelines(lines)
+    return tmpdir
+
+
+def test_build_lexicon(tmpdir):
+    data_dir = make_data_dir(tmpdir)
+    lexicon = build_lexicon(data_dir, 'lt', jobs=2, chunksize=2)
+    assert {entry.lemma for entry in lexicon['žodžiai']} == {'žodis'}
+    assert LexiconEntry('žmogus', 'nmsl', 'žmogus', 'žmog') in lexicon['žmoguje']
+    assert lexicon == build_lexicon(data_dir, 'lt', jobs=1)
+
+
+def test_lexicon_lookup(tmpdir):
+    data_dir = make_data_dir(tmpdir)
+    cache_dir = pathlib.Path(str(tmpdir)) / 'cache'
+    path = pathlib.Path(str(tmpdir)) / 'lt.lexicon'
+    compile_lexicon(data_dir, 'lt', path, jobs=2)
+
+    lexicon = Lexicon(str(path))
+    assert lexicon.get('xyzzy') == []
+    assert lexicon.get('žodžiai') == build_lexicon(data_dir, 'lt', jobs=1)['žodžiai']
+
+    gt = gramtool.GramTool(data_dir, lexicon=path, cache_dir=cache_dir)
+    rule_based = gramtool.GramTool(data_dir, cache_dir=cache_dir)
+    for word in ['Vilniaus', 'žmoguje', 'medžius', 'dėžėje', 'xyzzy']:
+        assert gt.get_lemma(word) == rule_based.get_lemma(word)
+    for word in ['Vilnius', 'žmogus', 'medis', 'dėžė']:
+        assert gt.change_form(word, case='locative') == rule_based.change_form(word, case='locative')
+        assert gt.change_form(word, number='plural') == rule_based.change_form(word, number='plural')
+
+
+def test_stale_lexicon(tmpdir, caplog):
+    data_dir = make_data_dir(tmpdir)
+    cache_dir = pathlib.Path(str(tmpdir)) / 'cache'
+    path = pathlib.Path(str(tmpdir)) / 'lt.lexicon'
+    source_hash = get_lexicon_hash(data_dir, 'lt')
+    with path.open('wb') as f:
+        write_lexicon({'namo': [LexiconEntry('stale', 'nmsg', 'removed', 'nam')]}, f, source_hash)
+
+    # Entries of rules, that are not in grammar any more, are skipped.
+    gt = gramtool.GramTool(data_dir, lexicon=path, cache_dir=cache_dir)
+    assert gt.lexicon.source_hash == source_hash
+    assert gt.get_lemma('namo') == 'stale'
+    assert list(gt.iter_form_tables('namo')) == []
+
+    with (data_dir / 'lt' / 'grammar').open('a') as f:
+        f.write('\n# changed\n')
+    with pytest.raises(ValueError):
+        Lexicon(str(path), get_lexicon_hash(data_dir, 'lt'))
+    gt = gramtool.GramTool(data_dir, lexicon=path, cache_dir=cache_dir)
+    assert gt.lexicon is None
+    assert gt.get_lemma('namo') == 'namas'
+    assert 'stale lexicon' in caplog.text
+
+
+def test_build_folded_index():
+    lexicon = [
+        ('sakė', [LexiconEntry('sakyti', 'v', 'r1', 's')]),
+        ('šake', [LexiconEntry('šaka', 'n', 'r2', 'šak')]),
+        ('sake', [LexiconEntry('sakas', 'n', 'r3', 'sak')]),
+        ('namas', [LexiconEntry('namas', 'n', 'r4', 'nam')]),
+    ]
+    index = build_folded_index(lexicon, {'šaka': 0, 'sakyti': 1})
+    assert index == {'sake': ['šake', 'sakė', 'sake']}
+    assert fold('Žmogų') == 'Zmogu'
+
+
+def test_folded_lookup(tmpdir):
+    data_dir = make_data_dir(tmpdir)
+    cache_dir = pathlib.Path(str(tmpdir)) / 'cache'
+    lexicon_path = pathlib.Path(str(tmpdir)) / 'lt.lexicon'
+    path = pathlib.Path(str(tmpdir)) / 'lt.folded'
+    compile_lexicon(data_dir, 'lt', lexicon_path, jobs=2)
+    assert compile_folded_index(data_dir, 'lt', lexicon_path, path) > 0
+
+    folded = FoldedIndex(str(path))
+    assert folded.get('zmogaus') == ['žmogaus']
+    assert folded.get('namas') == []
+    assert folded.resolve('zmogaus') == 'žmogaus'
+    assert folded.resolve('žmogaus') == 'žmogaus'
+    assert folded.resolve('zmogaūs') == 'žmogaus'
+    assert folded.resolve('xyzzy') == 'xyzzy'
+
+    rule_based = gramtool.GramTool(data_dir, cache_dir=cache_dir)
+    for lexicon in [None, lexicon_path]:
+        gt = gramtool.GramTool(data_dir, cache_dir=cache_dir, lexicon=lexicon, folded=path)
+        assert gt.get_lemma('zmogaus') == 'žmogus'
+        assert gt.get_lemma('dezeje') == 'dėžė'
+        assert gt.get_lemma('namo') == 'namas'
+        assert gt.change_form('zmogus', case='locative') == rule_based.change_form('žmogus', case='locative')
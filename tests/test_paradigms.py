@@ -0,0 +1,36 @@
+import pathlib
+
+import pkg_resources as pres
+
+from gramtool import gt
+from gramtool.paradigms import get_paradigms
+from gramtool.paradigms import generate_paradigms
+from gramtool.paradigms import iter_paradigm_rows
+
+
+WORDS = ['žmogus', 'namas', 'xyzzy', 'žodis', 'dėžė', 'Vilnius', 'medis']
+
+
+def test_get_paradigms():
+    paradigms = get_paradigms(gt.grammar, 'namas')
+    assert [rule for rule, stem, forms in paradigms] == ['daiktavardis -as,-o (namas)']
+    rule, stem, forms = paradigms[0]
+    assert stem == 'nam'
+    assert ('nmsg', 'namo') in forms
+
+
+def test_generate_paradigms():
+    data_dir = pathlib.Path(pres.resource_filename('gramtool', 'data'))
+    result = list(generate_paradigms(data_dir, 'lt', WORDS, jobs=3, chunksize=2))
+    assert result == [(word, get_paradigms(gt.grammar, word)) for word in WORDS]
+
+
+def test_paradigm_rows():
+    rows = list(iter_paradigm_rows([('namo', get_paradigms(gt.grammar, 'namo'))]))
+    assert dict(rows[1]) == {
+        'input': 'namo',
+        'lemma': 'namas',
+        'rule': 'daiktavardis -as,-o (namas)',
+        'spec': 'nmsg',
+        'form': 'namo',
+    }
@@ -0,0 +1,60 @@
+from gramtool import gt
+from gramtool.phrases import TextProcessor
+from gramtool.phrases import tokenize
+from gramtool.phrases import iter_tokens
+
+
+def test_tokenize():
+    text = 'Vakar, Vilniaus   senamiestyje -- Šv. Jono g. 3-ias namas.\n'
+    tokens = tokenize(text)
+    assert ''.join(tokens) == text
+    assert 'Vilniaus' in tokens and '3-ias' in tokens and '\n' in tokens
+
+
+def test_iter_tokens():
+    chunks = ['gražus na', 'mas, ', 'medis']
+    assert list(iter_tokens(chunks)) == ['gražus', ' ', 'namas', ',', ' ', 'medis']
+    assert list(iter_tokens([])) == []
+
+    # Chunk ends inside a dashed word.
+    assert list(iter_tokens(['gražus-', 'namas'])) == ['gražus-namas']
+    assert list(iter_tokens(['a-b-', 'c d'])) == ['a-b-c', ' ', 'd']
+    assert list(iter_tokens(['gražus-', ' namas'])) == tokenize('gražus- namas')
+    assert list(iter_tokens(['gražus -', 'namas'])) == ['gražus', ' ', '-', 'namas']
+    assert list(iter_tokens(['gražus-'])) == ['gražus', '-']
+
+    consumed = []
+
+    def generate():
+        for chunk in ['namas ', 'medis ', 'žodis']:
+            consumed.append(chunk)
+            yield chunk
+
+    tokens = iter_tokens(generate())
+    assert next(tokens) == 'namas'
+    assert consumed == ['namas ']
+
+
+def test_lemmatize():
+    text = TextProcessor(gt)
+    assert text.lemmatize_text('Vilniaus žmonės, xyzzy.') == 'Vilnius žmogus, xyzzy.'
+    assert ''.join(text.lemmatize(['Vilniaus ', 'Vilniaus'])) == 'Vilnius Vilnius'
+    assert text.analyses.hits > 0
+
+
+def test_inflect_phrase():
+    text = TextProcessor(gt)
+    assert text.inflect_phrase('gražus namas', case='genitive') == 'gražaus namo'
+    assert text.inflect_phrase('gražios knygos', case='locative', number='plural') == 'gražiose knygose'
+    # Genitive attribute does not agree with the head noun and is kept.
+    assert text.inflect_phrase('didelio Vilniaus universiteto', case='nominative') == 'didelis Vilniaus universitetas'
+    assert text.inflect_phrase('xyzzy', case='genitive') is None
+    assert list(text.inflect(['namas', 'medis'], case='genitive')) == ['namo', 'medžio']
+
+
+def test_lemmatize_phrase():
+    text = TextProcessor(gt)
+    assert text.lemmatize_phrase('gražios knygos') == 'graži knyga'
+    assert text.lemmatize_phrase('naujuose namuose') == 'naujas namas'
+    assert text.lemmatize_phrase('Šiaulių banko') == 'Šiaulių bankas'
+    assert text.lemmatize_phrase('xyzzy') is None
@@ -0,0 +1,95 @@
+import os
+import threading
+
+import pytest
+
+from gramtool import gt
+from gramtool.client import Client
+from gramtool.client import ServerError
+from gramtool.server import Dispatcher
+from gramtool.server import create_server
+
+
+def test_dispatcher():
+    dispatcher = Dispatcher(gt)
+    assert dispatcher.handle({'method': 'lemma', 'word': 'žodžiai'}) == {'result': 'žodis'}
+    assert dispatcher.handle([
+        {'method': 'change_form', 'word': 'žmogus', 'case': 'locative'},
+        {'method': 'change_form', 'word': 'žmogus', 'case': 'incorrect'},
+        {'method': 'unknown'},
+        'žmogus',
+    ]) == [
+        {'result': 'žmoguje'},
+        {'error': "Unknown symbol 'incorrect' of 'case'."},
+        {'error': "Unknown method 'unknown', available methods: change_form, forms, lemma."},
+        {'error': "Request must be a JSON object."},
+    ]
+
+
+def test_dispatcher_invalid_word():
+    dispatcher = Dispatcher(gt)
+    error = {'error': "Request word must be a non-empty string."}
+    assert dispatcher.handle({'method': 'lemma', 'word': ''}) == error
+    assert dispatcher.handle({'method': 'lemma', 'word': ' '}) == error
+    assert dispatcher.handle({'method': 'lemma', 'word': 5}) == error
+    assert dispatcher.handle({'method': 'forms'}) == error
+
+
+def test_dispatcher_internal_error():
+    class Failing(object):
+        def get_lemma(self, word):
+            raise IndexError(word)
+
+    assert Dispatcher(Failing()).handle({'method': 'lemma', 'word': 'namas'}) == {'error': "Internal error: namas"}
+
+
+@pytest.fixture(params=['unix', 'http'])
+def address(request, tmpdir):
+    if request.param == 'unix':
+        address = 'unix:' + os.path.join(str(tmpdir), 'gramtool.sock')
+    else:
+        address = '127.0.0.1:0'
+    server = create_server(gt, address)
+    if request.param == 'http':
+        address = '%s:%d' % server.server_address
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield address
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_client(address):
+    with Client(address) as client:
+        assert client.lemma('žodžiai') == 'žodis'
+        assert client.lemma('namo') == 'namas'
+        assert client.change_form('žmogus', case='locative') == 'žmoguje'
+        assert ['nmsg', 'namo'] in client.forms('namas')[0]['forms']
+        assert client.batch([
+            {'method': 'lemma', 'word': 'Vilniaus'},
+            {'method': 'lemma', 'word': 'xyzzy'},
+        ]) == [{'result': 'Vilnius'}, {'result': None}]
+        with pytest.raises(ServerError):
+            client.change_form('žmogus', case='incorrect')
+        assert client.batch([{'method': 'lemma', 'word': ''}, {'method': 'lemma', 'word': 5}]) == [
+            {'error': "Request word must be a non-empty string."},
+        ] * 2
+        assert client.lemma('namo') == 'namas'
+
+
+def test_concurrent_clients(address):
+    words = ['žodžiai', 'namo', 'Vilniaus', 'žmoguje'] * 5
+    expected = [gt.get_lemma(word) for word in words]
+    results = {}
+
+    def run(i):
+        with Client(address) as client:
+            results[i] = [client.lemma(word) for word in words]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: expected for i in range(4)}
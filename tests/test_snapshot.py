@@ -0,0 +1,59 @@
+import shutil
+import pathlib
+
+import pkg_resources as pres
+
+from gramtool.grammar import Grammar
+from gramtool.parser import get_grammar_rules
+from gramtool.utils.grammar import get_grammar_tree
+from gramtool.snapshot import compile_grammar
+from gramtool.snapshot import load_snapshot
+from gramtool.snapshot import read_snapshot
+from gramtool.snapshot import get_source_files
+from gramtool.snapshot import get_source_hash
+
+
+def copy_data(tmpdir):
+    data_dir = pathlib.Path(pres.resource_filename('gramtool', 'data'))
+    tmpdir = pathlib.Path(str(tmpdir))
+    (tmpdir / 'data' / 'lt').mkdir(parents=True)
+    for path in get_source_files(data_dir, 'lt'):
+        shutil.copy(str(path), str(tmpdir / 'data' / path.relative_to(data_dir)))
+    return tmpdir / 'data', tmpdir / 'cache'
+
+
+def test_compile_and_load(tmpdir):
+    data_dir, cache_dir = copy_data(tmpdir)
+    path = compile_grammar(data_dir, 'lt', cache_dir)
+    source_hash = get_source_hash(get_source_files(data_dir, 'lt'))
+    assert read_snapshot(path, source_hash) is not None
+
+    snapshot = load_snapshot(data_dir, 'lt', cache_dir)
+    symbols = get_grammar_tree(str(data_dir / 'grammar.yaml'))
+    rules = get_grammar_rules(symbols, str(data_dir / 'lt' / 'grammar'))
+    grammar = Grammar(None, symbols, rules)
+    stems, suffixes, suffix_trie = snapshot['indexes']
+    assert snapshot['symbols'] == symbols
+    assert list(snapshot['rules']) == list(rules)
+    assert [key for key, rule in suffixes] == [key for key, rule in grammar.suffixes]
+    assert suffix_trie.match('žodžiai') == grammar.suffix_trie.match('žodžiai')
+
+
+def test_stale_snapshot(tmpdir):
+    data_dir, cache_dir = copy_data(tmpdir)
+    load_snapshot(data_dir, 'lt', cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+    # Other languages and cache files are kept.
+    (cache_dir / 'en-0123456789abcdef.pickle').write_bytes(b'')
+    (cache_dir / 'lt-stems-0123456789abcdef.pickle').write_bytes(b'')
+
+    with (data_dir / 'lt' / 'grammar').open('a') as f:
+        f.write('\n@rule test-snapshot\nnmsn . uxas\n')
+
+    snapshot = load_snapshot(data_dir, 'lt', cache_dir)
+    assert 'test-snapshot' in snapshot['rules']
+    # Stale snapshot is removed, only the fresh one is left.
+    source_hash = get_source_hash(get_source_files(data_dir, 'lt'))
+    assert sorted(path.name for path in cache_dir.iterdir()) == [
+        'en-0123456789abcdef.pickle', 'lt-%s.pickle' % source_hash[:16], 'lt-stems-0123456789abcdef.pickle',
+    ]
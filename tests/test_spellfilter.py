@@ -0,0 +1,76 @@
+import pathlib
+import itertools
+
+from gramtool import gt
+from gramtool.affixes import AffixDictionary
+from gramtool.grammar import Grammar
+from gramtool.snapshot import load_spell_filter
+from gramtool.spellfilter import SpellFilter
+from gramtool.utils.bloom import BloomFilter
+from gramtool.utils.bloom import get_bloom_size
+
+
+def test_bloom_filter(tmpdir):
+    keys = [b'word%d' % i for i in range(5000)]
+    bloom = BloomFilter(*get_bloom_size(len(keys), 0.01))
+    for key in keys:
+        bloom.add(key)
+    path = tmpdir.join('test.bloom')
+    with path.open('wb') as f:
+        bloom.write(f)
+    bloom = BloomFilter.load(str(path))
+    assert all(key in bloom for key in keys)
+    others = [b'other%d' % i for i in range(5000)]
+    assert sum(key in bloom for key in others) < 5000 * 0.02
+
+
+def test_iter_words():
+    d = AffixDictionary(str(gt.data_dir / 'lt' / 'hunspell.aff'), str(gt.data_dir / 'lt' / 'hunspell.dic'))
+    d.words = dict(itertools.islice(d.words.items(), 20000, 20300))
+    words = set(d.iter_words())
+    assert len(words) > 2000
+    assert all(d.check_word(word) for word in words)
+
+
+def write_test_dictionary(tmpdir):
+    tmpdir.join('lt').ensure(dir=True)
+    tmpdir.join('lt', 'hunspell.aff').write('SET UTF-8\nPFX A Y 1\nPFX A 0 ne .\nSFX C Y 1\nSFX C as ai as\n')
+    tmpdir.join('lt', 'hunspell.dic').write('2\nnamas/AC\nmedis\n')
+
+
+def test_load_spell_filter(tmpdir):
+    write_test_dictionary(tmpdir)
+    spell_filter = load_spell_filter(pathlib.Path(str(tmpdir)), 'lt', 0.001, pathlib.Path(str(tmpdir.join('cache'))))
+    assert len(tmpdir.join('cache').listdir()) == 1
+    words = ['namas', 'Namai', 'NENAMAI', 'nenamas', 'medis', 'namas-medis', '12', 'medžiai', 'nemedis', 'xyz']
+    assert [spell_filter.check(w) for w in words] == [True] * 7 + [False] * 3
+    assert spell_filter.info()['checks'] == 10
+    assert spell_filter.info()['rejects'] == 3
+
+    # Filter of changed dictionary replaces stale one, filters of other error rates are kept.
+    load_spell_filter(pathlib.Path(str(tmpdir)), 'lt', 0.01, pathlib.Path(str(tmpdir.join('cache'))))
+    tmpdir.join('lt', 'hunspell.dic').write('2\nnamas/AC\nkelias\n')
+    spell_filter = load_spell_filter(pathlib.Path(str(tmpdir)), 'lt', 0.001, pathlib.Path(str(tmpdir.join('cache'))))
+    assert spell_filter.check('kelias') is True
+    assert len(tmpdir.join('cache').listdir()) == 2
+
+
+def test_grammar_spell_filter():
+    words = ['Vilniaus', 'žodžiai', 'namo', 'medžius', 'xyzzy']
+    grammar = gt.grammar
+
+    # Filter of all forms hunspell accepts for these words.
+    bloom = BloomFilter(*get_bloom_size(1000, 0.01))
+    for word in words:
+        for stem, suffix, rule in grammar.find_rules(word):
+            for form in rule.build_forms(stem):
+                if gt.hunspell.spell(form):
+                    bloom.add(form.lower().encode('utf-8'))
+
+    spell_filter = SpellFilter(bloom)
+    filtered = Grammar(gt.hunspell, grammar.tree, grammar.rules, None, None, spell_filter).bind(gt.hunspell)
+    assert filtered.spell_filter is spell_filter
+    assert [[str(lemma) for lemma, w in filtered.iter_rules(word)] for word in words] == [
+        [str(lemma) for lemma, w in grammar.iter_rules(word)] for word in words
+    ]
+    assert spell_filter.rejects > 0
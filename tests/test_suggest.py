@@ -0,0 +1,79 @@
+import pathlib
+
+import gramtool
+
+from gramtool.batch import iter_batch
+from gramtool.suggest import SuggestIndex
+from gramtool.suggest import get_deletes
+from gramtool.suggest import get_distance
+from gramtool.suggest import build_suggest_index
+from gramtool.suggest import write_suggest_index
+from gramtool.suggest import compile_suggest_index
+
+
+def test_get_deletes():
+    assert get_deletes('abc', 1) == {'abc', 'bc', 'ac', 'ab'}
+    assert get_deletes('abc', 2) == {'abc', 'bc', 'ac', 'ab', 'a', 'b', 'c'}
+
+
+def test_get_distance():
+    assert get_distance('namas', 'namas', 2) == 0
+    assert get_distance('namas', 'nams', 2) == 1
+    assert get_distance('namas', 'naams', 2) == 1
+    assert get_distance('namas', 'nomos', 2) == 2
+    assert get_distance('namas', 'medis', 2) == 3
+    assert get_distance('namas', 'n', 2) == 3
+
+
+def test_suggest(tmpdir):
+    words = [('namas', 2), ('namai', 1), ('nams', 5), ('žmogus', 0), ('medis', 3)]
+    path = str(tmpdir.join('suggest'))
+    with open(path, 'wb') as f:
+        write_suggest_index(*build_suggest_index(words, 2, 4), f=f, max_distance=2, prefix_length=4)
+
+    index = SuggestIndex(path)
+    assert (index.max_distance, index.prefix_length, index.nwords) == (2, 4, 5)
+    assert index.suggest('namas') == [('namas', 0), ('namai', 1), ('nams', 1)]
+    assert index.suggest('nmaas', limit=2) == [('namas', 1), ('namai', 2)]
+    assert index.suggest('Zmogus') == [('žmogus', 1)]
+    assert index.suggest('žmoguss') == [('žmogus', 1)]
+    assert index.suggest('namas', max_distance=0) == [('namas', 0)]
+    assert index.suggest('xyzzy') == []
+
+
+def write_test_data(tmpdir):
+    tmpdir.join('lt').ensure(dir=True)
+    tmpdir.join('lt', 'hunspell.aff').write('SET UTF-8\n')
+    tmpdir.join('lt', 'hunspell.dic').write_text('4\nžmogus\nVilnius\nnamas\nmedis\n', encoding='utf-8')
+    tmpdir.join('lt', 'frequency').write('Vilnius\n')
+    return pathlib.Path(str(tmpdir))
+
+
+def test_corrected_lemma(tmpdir):
+    path = pathlib.Path(str(tmpdir)) / 'lt.suggest'
+    assert compile_suggest_index(write_test_data(tmpdir), 'lt', path, max_distance=1) == 4
+
+    gt = gramtool.GramTool(suggest_index=path)
+    assert gt.suggest('žmoguss', limit=1) == ['žmogus']
+    assert gt.get_corrected_lemma('Vilniaus') == 'Vilnius'
+    assert gt.get_corrected_lemma('žmoguss') == 'žmogus'
+    assert gt.get_corrected_lemma('xyzzyxyzzy') is None
+    assert gt.correct('geras žmoguss') == ('geras žmogus', 'geras žmogus')
+    assert gt.correct('xyzzyxyzzy') == ('xyzzyxyzzy', None)
+    assert gt.correct(' ') == (' ', None)
+
+
+def test_batch_correct(tmpdir):
+    path = pathlib.Path(str(tmpdir)) / 'lt.suggest'
+    compile_suggest_index(write_test_data(tmpdir), 'lt', path, max_distance=1)
+    gt = gramtool.GramTool(suggest_index=path)
+
+    lines = ['žmoguss', 'žmogus', 'xyzzy']
+    assert [list(r.values()) for r in iter_batch(gt, lines)] == [
+        ['žmoguss', None], ['žmogus', 'žmogus'], ['xyzzy', None],
+    ]
+    assert [list(r.items()) for r in iter_batch(gt, lines, correct=True, case='locative')] == [
+        [('input', 'žmoguss'), ('corrected', 'žmogus'), ('lemma', 'žmogus'), ('form', 'žmoguje')],
+        [('input', 'žmogus'), ('corrected', None), ('lemma', 'žmogus'), ('form', 'žmoguje')],
+        [('input', 'xyzzy'), ('corrected', None), ('lemma', None), ('form', None)],
+    ]